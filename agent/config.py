@@ -4,7 +4,13 @@ Configuration management for Socius agent
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+# Parse .env at most once per process, even if this module ends up imported
+# under more than one name (e.g. ``config`` and ``agent.config``).
+_DOTENV_LOADED_FLAG = '_SOCIUS_DOTENV_LOADED'
+
+if not os.environ.get(_DOTENV_LOADED_FLAG):
+    load_dotenv()
+    os.environ[_DOTENV_LOADED_FLAG] = '1'
 
 
 class Config:
@@ -34,10 +40,23 @@ class Config:
     HIGH_MATCH_THRESHOLD = float(os.getenv('HIGH_MATCH_THRESHOLD', 0.75))
     AUTO_SCHEDULE_ENABLED = os.getenv('AUTO_SCHEDULE_ENABLED', 'true').lower() == 'true'
 
-    @classmethod
-    def validate(cls):
-        """Validate required configuration"""
-        if not cls.ANTHROPIC_API_KEY:
-            raise ValueError("ANTHROPIC_API_KEY is required")
+    # API server
+    # Worker threads for blocking MCP, Gmail and iMessage calls made from the API
+    WORKER_THREADS = int(os.getenv('WORKER_THREADS', 100))
+    ACCESS_LOG = os.getenv('ACCESS_LOG', 'false').lower() == 'true'
+    # Seconds between background health probes of the MCP and iMessage servers
+    HEALTH_PROBE_INTERVAL = float(os.getenv('HEALTH_PROBE_INTERVAL', 5))
+
+
+def validate_config() -> None:
+    """
+    Validate required configuration.
+
+    Config values are fixed once the environment has been read, so entry
+    points call this once at startup rather than per request.
 
-        return True
+    Raises:
+        ValueError: If a required setting is missing
+    """
+    if not Config.ANTHROPIC_API_KEY:
+        raise ValueError("ANTHROPIC_API_KEY is required")
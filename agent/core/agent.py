@@ -1,114 +1,493 @@
 """
-Core Socius AI Agent with Claude + LangChain
+Core Socius AI Agent with Claude tool calling
 """
-from anthropic import Anthropic
-from langchain_anthropic import ChatAnthropic
-from typing import Dict, List, Optional
+from anthropic import AsyncAnthropic
+from anthropic.types import Message
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import cached_property, wraps
+from typing import Awaitable, Callable, Dict, List, Literal, Optional, Set, Tuple, TypeVar
+from weakref import WeakKeyDictionary
+import asyncio
 import json
+import re
+import sys
+import threading
+import time
 
 from config import Config
+from micro_batcher import MicroBatcher
+from ttl_cache import TTLCache
 from tools.imessage_tool import iMessageTool
 from tools.gmail_tool import GmailTool
 from tools.mcp_client import MCPClient
-from core.matching import MatchingEngine
+from core.matching import MatchingEngine, ProfileFeatures
 from core.permissions import PermissionsManager, ActionType, PermissionLevel
 
-
-class SociusAgent:
-    """Main AI agent for Socius networking"""
-
-    def __init__(self, user_id: str):
-        self.user_id = user_id
-        self.anthropic = Anthropic(api_key=Config.ANTHROPIC_API_KEY)
-
-        # Initialize tools
-        self.imessage_tool = iMessageTool()
-        self.gmail_tool = GmailTool()
-        self.mcp_client = MCPClient()
-
-        # Initialize core systems
-        self.matching_engine = MatchingEngine(Config.HIGH_MATCH_THRESHOLD)
-        self.permissions_manager = PermissionsManager(self.mcp_client)
-
-        # Get user profile and preferences
-        self.user_profile = self.mcp_client.get_user_profile(user_id)
-        self.user_preferences = self.mcp_client.get_user_preferences(user_id)
-
-        # Initialize LangChain agent
-        self._setup_langchain_agent()
-
-    def _setup_langchain_agent(self):
-        """Setup Claude with tool calling, including full GmailTool integration"""
-        self.tools = [
-            {
-                "name": "send_email",
-                "description": "Send an email to someone.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "to": {"type": "string", "description": "Recipient email address"},
-                        "subject": {"type": "string", "description": "Email subject"},
-                        "body": {"type": "string", "description": "Email body content"},
-                        "cc": {"type": "string", "description": "CC recipients (optional)"},
-                        "bcc": {"type": "string", "description": "BCC recipients (optional)"}
-                    },
-                    "required": ["to", "subject", "body"]
-                }
+# Settings read on every Claude round-trip, bound once at import
+CLAUDE_MODEL = Config.CLAUDE_MODEL
+
+# Matches the agent asking the user to take over ("take over", "take-over", "takeover")
+_TAKEOVER_RE = re.compile(r'\btake[- ]?over\b', re.IGNORECASE)
+
+# {{variable}} placeholders in Sanity message templates
+_TEMPLATE_VAR_RE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+# How an autonomous introduction is drafted: immediately, or through the
+# Message Batches API (half the token cost, results within 24 hours)
+OutreachMode = Literal["realtime", "batch"]
+
+# Token budget for drafting a short introduction
+_DRAFT_MAX_TOKENS = 256
+
+# Drafted introductions are reused for people with the same profile fields
+# at the same event for this long, in seconds
+_INTRO_CACHE_TTL = 6 * 3600
+_INTRO_CACHE_SIZE = 256
+
+# Profile fields a drafted introduction is written from. Drafts are cached by
+# exactly these fields, so nothing else about one person can reach another.
+_INTRO_PROFILE_FIELDS = ('role', 'industry', 'seniority', 'interests', 'goals')
+
+# Number of recent conversation messages included in a reply prompt
+_PROMPT_HISTORY_LIMIT = 5
+
+# Upper bound on tool calls from a single turn that run concurrently
+_MAX_PARALLEL_TOOLS = 4
+
+# Tools with external side effects. They run one at a time, in the order
+# Claude asked for them, while read-only tools run concurrently.
+_SEQUENTIAL_TOOLS = frozenset({"send_email", "create_calendar_event"})
+
+# Prompts and tool results are serialized on every turn. Use orjson when it is
+# installed; otherwise bind one compact stdlib encoder up front, since
+# json.dumps builds a new encoder whenever it is given non-default options.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _ORJSON_DUMPS = orjson.dumps
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def _compact_json(value: object) -> str:
+        """Serialize a value for a prompt or tool result, without pretty-printing whitespace"""
+        return _ORJSON_DUMPS(value, option=_ORJSON_OPTIONS).decode()
+else:
+    _JSON_ENCODE = json.JSONEncoder(separators=(',', ':')).encode
+
+    def _compact_json(value: object) -> str:
+        """Serialize a value for a prompt or tool result, without pretty-printing whitespace"""
+        return _JSON_ENCODE(value)
+
+
+def _content_params(content: List) -> List[Dict]:
+    """
+    Convert the content blocks of a Claude response into plain request params.
+
+    The assistant turn is re-sent on every later call of a tool-use loop;
+    storing it as plain dicts with only the fields the API accepts means
+    the SDK does not have to re-walk its response models each time.
+    """
+    params = []
+    for block in content:
+        if block.type == "text":
+            params.append({"type": "text", "text": block.text})
+        elif block.type == "tool_use":
+            params.append({"type": "tool_use", "id": block.id, "name": block.name, "input": block.input})
+        else:
+            params.append(block.model_dump(exclude_none=True))
+    return params
+
+
+def _fill_template(content: str, values: Dict[str, str]) -> Optional[str]:
+    """
+    Fill a message template's {{variable}} placeholders.
+
+    Args:
+        content: Template content
+        values: Values for the placeholders
+
+    Returns:
+        The filled message, or None if any placeholder has no value
+    """
+    missing = False
+
+    def substitute(match: re.Match) -> str:
+        nonlocal missing
+        value = values.get(match.group(1))
+        if not value:
+            missing = True
+            return ''
+        return value
+
+    message = _TEMPLATE_VAR_RE.sub(substitute, content)
+    return None if missing else message
+
+
+def _whole_word(text: str) -> str:
+    """
+    Pattern matching text literally, but not as part of a longer word.
+
+    Lookarounds rather than \\b, so names that start or end with punctuation
+    (e.g. "Jr.") still match.
+    """
+    return r'(?<!\w)' + re.escape(text) + r'(?!\w)'
+
+
+def _name_to_placeholder(message: str, name: Optional[str]) -> str:
+    """
+    Replace a person's full name with {{name}} and first name with {{first_name}}.
+
+    Args:
+        message: Message addressed to the person
+        name: The person's name
+
+    Returns:
+        The message with the name turned into template placeholders
+    """
+    if not name or not name.split():
+        return message
+    name = name.strip()
+    message = re.sub(_whole_word(name), '{{name}}', message)
+    return re.sub(_whole_word(name.split()[0]), '{{first_name}}', message)
+
+
+def _format_history(history: List[Dict], names: Dict[str, str]) -> str:
+    """
+    Render conversation history as a plain "Name: message" transcript.
+
+    Claude only needs who said what; ids, timestamps and metadata would
+    cost serialization time and prompt tokens on every incoming message.
+
+    Args:
+        history: Conversation messages in chronological order
+        names: Display name for each sender id
+
+    Returns:
+        One line per message
+    """
+    return '\n'.join(
+        f"{names.get(entry.get('sender'), entry.get('sender'))}: {entry.get('message', '')}"
+        for entry in history
+    )
+
+
+# Marks the end of a prompt prefix Claude may cache between requests
+_EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+# Claude tool definitions. Identical for every user, so built once at import
+# and shared by all agents. The last one carries a cache breakpoint so the
+# tool definitions are served from Anthropic's prompt cache.
+_CLAUDE_TOOL_SCHEMAS = (
+    {
+        "name": "send_email",
+        "description": "Send an email to someone.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "to": {"type": "string", "description": "Recipient email address"},
+                "subject": {"type": "string", "description": "Email subject"},
+                "body": {"type": "string", "description": "Email body content"},
+                "cc": {"type": "string", "description": "CC recipients (optional)"},
+                "bcc": {"type": "string", "description": "BCC recipients (optional)"}
             },
-            {
-                "name": "create_calendar_event",
-                "description": "Create a calendar event.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "summary": {"type": "string", "description": "Event title"},
-                        "start_time": {"type": "string", "description": "Start time ISO format"},
-                        "end_time": {"type": "string", "description": "End time ISO format"},
-                        "attendees": {"type": "array", "items": {"type": "string"}, "description": "Attendee emails"},
-                        "description": {"type": "string", "description": "Optional event description"}
-                    },
-                    "required": ["summary", "start_time", "end_time", "attendees"]
-                }
+            "required": ["to", "subject", "body"]
+        }
+    },
+    {
+        "name": "create_calendar_event",
+        "description": "Create a calendar event.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "summary": {"type": "string", "description": "Event title"},
+                "start_time": {"type": "string", "description": "Start time ISO format"},
+                "end_time": {"type": "string", "description": "End time ISO format"},
+                "attendees": {"type": "array", "items": {"type": "string"}, "description": "Attendee emails"},
+                "description": {"type": "string", "description": "Optional event description"}
             },
-            {
-                "name": "find_next_free_slot",
-                "description": "Find the next available free time slot in the user's calendar.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "duration_minutes": {"type": "integer", "description": "Length of the meeting in minutes"},
-                        "days_ahead": {"type": "integer", "description": "Search within the next N days"}
-                    },
-                    "required": ["duration_minutes"]
-                }
+            "required": ["summary", "start_time", "end_time", "attendees"]
+        }
+    },
+    {
+        "name": "find_next_free_slot",
+        "description": "Find the next available free time slot in the user's calendar.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "duration_minutes": {"type": "integer", "description": "Length of the meeting in minutes"},
+                "days_ahead": {"type": "integer", "description": "Search within the next N days"}
             },
-            {
-                "name": "get_email_message",
-                "description": "Fetch a single Gmail message by its ID.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "message_id": {"type": "string", "description": "Gmail message ID"}
-                    },
-                    "required": ["message_id"]
-                }
+            "required": ["duration_minutes"]
+        }
+    },
+    {
+        "name": "get_email_message",
+        "description": "Fetch a single Gmail message by its ID.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "message_id": {"type": "string", "description": "Gmail message ID"}
             },
-            {
-                "name": "get_calendar_event",
-                "description": "Fetch a single Google Calendar event by ID.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "event_id": {"type": "string", "description": "Calendar event ID"},
-                        "calendar_id": {"type": "string", "description": "Calendar ID (default: primary)"}
-                    },
-                    "required": ["event_id"]
-                }
-            }
-        ]
+            "required": ["message_id"]
+        }
+    },
+    {
+        "name": "get_calendar_event",
+        "description": "Fetch a single Google Calendar event by ID.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "event_id": {"type": "string", "description": "Calendar event ID"},
+                "calendar_id": {"type": "string", "description": "Calendar ID (default: primary)"}
+            },
+            "required": ["event_id"]
+        },
+        "cache_control": _EPHEMERAL_CACHE
+    }
+)
+
+
+# Process-wide clients. None of them carry per-user state, so every agent
+# shares one instance and its connection pool / OAuth session instead of
+# paying a fresh TLS handshake or auth flow per user.
+
+# AsyncAnthropic pools connections on the event loop that opened them, so
+# the async client is shared per loop rather than per process
+_ASYNC_ANTHROPIC_BY_LOOP: "WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncAnthropic]" = WeakKeyDictionary()
+
+
+def _shared_anthropic() -> AsyncAnthropic:
+    """
+    AsyncAnthropic client shared by all agents on the running event loop
+
+    Raises:
+        RuntimeError: If called outside a running event loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_ANTHROPIC_BY_LOOP.get(loop)
+    if client is None:
+        client = AsyncAnthropic(api_key=Config.ANTHROPIC_API_KEY, max_retries=2)
+        _ASYNC_ANTHROPIC_BY_LOOP[loop] = client
+    return client
+
+
+# Profile lookups from concurrent requests on a loop, coalesced per MCP client.
+# Clients are long-lived, so holding them here does not leak in practice.
+_PROFILE_BATCHERS_BY_LOOP: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[MCPClient, MicroBatcher]]" = WeakKeyDictionary()
+
+
+def _profile_batcher(mcp_client: MCPClient) -> MicroBatcher:
+    """
+    Batcher coalescing profile lookups through an MCP client on the running loop
+
+    Raises:
+        RuntimeError: If called outside a running event loop
+    """
+    batchers = _PROFILE_BATCHERS_BY_LOOP.setdefault(asyncio.get_running_loop(), {})
+    batcher = batchers.get(mcp_client)
+    if batcher is None:
+        batcher = batchers[mcp_client] = MicroBatcher(mcp_client.get_user_profiles)
+    return batcher
+
+
+T = TypeVar('T')
+
+
+def _process_singleton(factory: Callable[[], T]) -> Callable[[], T]:
+    """
+    Make a factory build its object at most once per process.
+
+    Unlike lru_cache, which may run the factory in several threads that miss
+    at the same time, the first build happens under a lock, so concurrent
+    first requests never create (or authenticate) a second client. Once
+    built, lookups take no lock.
+    """
+    lock = threading.Lock()
+    instance: List[T] = []
+
+    @wraps(factory)
+    def get() -> T:
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    return get
+
+
+@_process_singleton
+def shared_imessage_tool() -> iMessageTool:
+    """iMessage bridge client shared by all agents and the API"""
+    return iMessageTool()
+
+
+@_process_singleton
+def _shared_gmail_tool() -> GmailTool:
+    """Gmail and Calendar client shared by all agents"""
+    return GmailTool()
+
+
+@_process_singleton
+def shared_mcp_client() -> MCPClient:
+    """MCP server client shared by all agents and the API routes"""
+    return MCPClient()
+
+
+class SociusAgent:
+    """Main AI agent for Socius networking"""
+
+    tools = _CLAUDE_TOOL_SCHEMAS
+
+    def __init__(
+        self,
+        user_id: str,
+        mcp_client: Optional[MCPClient] = None,
+        gmail_tool: Optional[GmailTool] = None,
+        imessage_tool: Optional[iMessageTool] = None
+    ):
+        """
+        Initialize an agent for a user.
+
+        Args:
+            user_id: User the agent acts for
+            mcp_client: MCP client to use instead of the process-wide one
+            gmail_tool: Gmail client to use instead of the process-wide one
+            imessage_tool: iMessage client to use instead of the process-wide one
+        """
+        # Interned: the same IDs recur as keys in the agent cache and in MCP payloads
+        self.user_id = sys.intern(user_id)
+
+        # Injected clients take the place of the shared ones the cached
+        # properties below would otherwise create
+        for name, client in (
+            ('mcp_client', mcp_client),
+            ('gmail_tool', gmail_tool),
+            ('imessage_tool', imessage_tool),
+        ):
+            if client is not None:
+                self.__dict__[name] = client
+
+    # Tools, core systems and the MCP-backed profile are built on first use,
+    # so constructing an agent does no network I/O and code paths only pay
+    # for the collaborators they actually touch.
+
+    @cached_property
+    def imessage_tool(self) -> iMessageTool:
+        """iMessage bridge client (shared by all agents)"""
+        return shared_imessage_tool()
+
+    @cached_property
+    def gmail_tool(self) -> GmailTool:
+        """Gmail and Calendar client (shared by all agents, authenticates on first access)"""
+        return _shared_gmail_tool()
+
+    @cached_property
+    def mcp_client(self) -> MCPClient:
+        """MCP server client (shared by all agents)"""
+        return shared_mcp_client()
+
+    @cached_property
+    def matching_engine(self) -> MatchingEngine:
+        """Compatibility scoring engine"""
+        return MatchingEngine(Config.HIGH_MATCH_THRESHOLD)
+
+    @cached_property
+    def _intro_cache(self) -> TTLCache[str]:
+        """
+        Drafted introductions keyed by the recipient's _INTRO_PROFILE_FIELDS and event.
+
+        Many people at one event share an industry, role and interests; their
+        Claude-drafted introductions are near-identical, so one draft is reused
+        with the name swapped in. The draft prompt contains only the key's
+        fields (plus the name), so a reused draft holds nothing specific to
+        the person it was first written for. Drafts are stored with {{name}} in place of
+        the recipient's name and {{first_name}} in place of their first name.
+        """
+        return TTLCache(maxsize=_INTRO_CACHE_SIZE, ttl=_INTRO_CACHE_TTL)
+
+    @cached_property
+    def permissions_manager(self) -> PermissionsManager:
+        """Permission checks backed by the user's MCP preferences"""
+        return PermissionsManager(self.mcp_client)
+
+    @cached_property
+    def _user_bundle(self) -> Dict:
+        """The user's profile and preferences, fetched from MCP in one request on first access"""
+        bundle = self.mcp_client.get_user_bundle(self.user_id)
+        # Drafts are written in the user's name and voice; after a refresh,
+        # keep them only if the profile and preferences came back unchanged
+        if bundle != self.__dict__.pop('_previous_bundle', bundle):
+            self.__dict__.pop('_intro_cache', None)
+        return bundle
+
+    @cached_property
+    def user_profile(self) -> Dict:
+        """Profile of the agent's user"""
+        return self._user_bundle.get('profile')
+
+    @cached_property
+    def _user_features(self) -> ProfileFeatures:
+        """The user's own profile prepared for matching, reused for every nearby person"""
+        return self.matching_engine.prepare_profile(self.user_profile)
+
+    @cached_property
+    def user_preferences(self) -> Dict:
+        """Preferences of the agent's user"""
+        return self._user_bundle.get('preferences')
+
+    @cached_property
+    def system_prompt(self) -> str:
+        """
+        System prompt rendered once per agent.
+
+        The profile and preferences it is built from are loaded once per
+        agent and not mutated afterwards, so the rendered string is reused
+        for every Claude call. Call ``invalidate_prompt`` after
+        changing either of them.
+        """
+        return self._get_system_prompt()
+
+    @cached_property
+    def _system_blocks(self) -> List[Dict]:
+        """
+        System prompt as a cacheable content block.
+
+        Tools and system prompt are identical on every turn of a tool-use
+        loop and across a user's runs, so the prefix is marked for
+        Anthropic's prompt cache and later turns skip re-processing it.
+        """
+        return [{"type": "text", "text": self.system_prompt, "cache_control": _EPHEMERAL_CACHE}]
+
+    def invalidate_prompt(self) -> None:
+        """Drop the cached system prompt so the next access re-renders it"""
+        self.__dict__.pop('system_prompt', None)
+        self.__dict__.pop('_system_blocks', None)
+
+    def refresh_profile(self) -> None:
+        """
+        Drop the cached profile, preferences and system prompt.
+
+        Call after the user's profile or preferences change in MCP; the
+        next access fetches them again and re-renders the prompt. Drafted
+        introductions are dropped then only if the refetched data differs.
+        """
+        previous = self.__dict__.pop('_user_bundle', None)
+        if previous is not None:
+            self.__dict__['_previous_bundle'] = previous
+        self.__dict__.pop('user_profile', None)
+        self.__dict__.pop('_user_features', None)
+        self.__dict__.pop('user_preferences', None)
+        if 'permissions_manager' in self.__dict__:
+            self.permissions_manager.invalidate_user_permissions(self.user_id)
+        self.invalidate_prompt()
 
     def _get_system_prompt(self) -> str:
-        """Get the system prompt for the agent"""
+        """Build the system prompt for the agent"""
         user_name = self.user_profile.get('name', 'User')
         user_role = self.user_profile.get('role', 'professional')
         user_interests = ', '.join(self.user_profile.get('interests', []))
@@ -121,7 +500,7 @@ Your primary role is to help {user_name} connect with interesting people at even
 About {user_name}:
 - Role: {user_role}
 - Interests: {user_interests}
-- Communication style: {json.dumps(conversation_style)}
+- Communication style: {_compact_json(conversation_style)}
 
 Your capabilities:
 1. Send iMessages and emails on {user_name}'s behalf
@@ -147,82 +526,184 @@ When someone responds:
 
 Remember: You represent {user_name}, so maintain their reputation and authenticity."""
 
+    @cached_property
+    def _tool_dispatch(self) -> Dict[str, Callable[[Dict], Dict]]:
+        """Map of Claude tool name to the bound method that executes it"""
+        return {
+            "send_email": self._tool_send_email,
+            "create_calendar_event": self._tool_create_calendar_event,
+            "find_next_free_slot": self._tool_find_next_free_slot,
+            "get_email_message": self._tool_get_email_message,
+            "get_calendar_event": self._tool_get_calendar_event,
+        }
+
     def _execute_tool(self, tool_name: str, tool_input: Dict) -> Dict:
         """Execute a tool and return the result"""
-        try:
-            if tool_name == "send_email":
-                return self.gmail_tool.send_email(
-                    to=tool_input['to'],
-                    subject=tool_input['subject'],
-                    body=tool_input['body'],
-                    cc=tool_input.get('cc'),
-                    bcc=tool_input.get('bcc')
-                )
-
-            elif tool_name == "create_calendar_event":
-                from datetime import datetime
-                start_time = datetime.fromisoformat(tool_input['start_time'])
-                end_time = datetime.fromisoformat(tool_input['end_time'])
-                return self.gmail_tool.create_calendar_event(
-                    summary=tool_input['summary'],
-                    start_time=start_time,
-                    end_time=end_time,
-                    attendees=tool_input['attendees'],
-                    description=tool_input.get('description')
-                )
-
-            elif tool_name == "find_next_free_slot":
-                duration = int(tool_input.get('duration_minutes', 30))
-                days_ahead = int(tool_input.get('days_ahead', 7))
-                slot = self.gmail_tool.find_free_slot(duration_minutes=duration, days_ahead=days_ahead)
-                return {
-                    "next_free_slot": slot.isoformat() if slot else None,
-                    "success": slot is not None
-                }
+        handler = self._tool_dispatch.get(tool_name)
+        if handler is None:
+            return {'error': f'Unknown tool: {tool_name}'}
 
-            elif tool_name == "get_email_message":
-                message_id = tool_input['message_id']
-                content = self.gmail_tool.get_emails([message_id])
-                return {"content": content}
+        try:
+            return handler(tool_input)
+        except Exception as e:
+            return {'error': str(e)}
 
-            elif tool_name == "get_calendar_event":
-                event_id = tool_input['event_id']
-                calendar_id = tool_input.get('calendar_id', 'primary')
-                return self.gmail_tool.get_calendar_event(event_id=event_id, calendar_id=calendar_id)
+    @cached_property
+    def _batch_tool_dispatch(self) -> Dict[str, Callable[[List[Dict]], List[Dict]]]:
+        """
+        Map of Claude tool name to a bound method that executes many calls at once
 
-            else:
-                return {'error': f'Unknown tool: {tool_name}'}
+        Calls to these tools from one assistant turn are grouped and served
+        with a single batched API request instead of one request per call.
+        """
+        return {
+            "get_email_message": self._tool_get_email_messages,
+            "get_calendar_event": self._tool_get_calendar_events,
+        }
 
+    def _execute_tool_batch(self, tool_name: str, tool_inputs: List[Dict]) -> List[Dict]:
+        """Execute several calls of a batchable tool and return one result per call"""
+        try:
+            return self._batch_tool_dispatch[tool_name](tool_inputs)
         except Exception as e:
-            return {'error': str(e)}
+            return [{'error': str(e)} for _ in tool_inputs]
+
+    def _tool_send_email(self, tool_input: Dict) -> Dict:
+        """Send an email through Gmail"""
+        return self.gmail_tool.send_email(
+            to=tool_input['to'],
+            subject=tool_input['subject'],
+            body=tool_input['body'],
+            cc=tool_input.get('cc'),
+            bcc=tool_input.get('bcc')
+        )
 
-    def handle_new_person_nearby(self, other_user_id: str, context: Dict) -> Dict:
+    def _tool_create_calendar_event(self, tool_input: Dict) -> Dict:
+        """Create a Google Calendar event"""
+        return self.gmail_tool.create_calendar_event(
+            summary=tool_input['summary'],
+            start_time=datetime.fromisoformat(tool_input['start_time']),
+            end_time=datetime.fromisoformat(tool_input['end_time']),
+            attendees=tool_input['attendees'],
+            description=tool_input.get('description')
+        )
+
+    def _tool_find_next_free_slot(self, tool_input: Dict) -> Dict:
+        """Find the next free calendar slot (the schema types both inputs as integers)"""
+        slot = self.gmail_tool.find_free_slot(
+            duration_minutes=tool_input.get('duration_minutes', 30),
+            days_ahead=tool_input.get('days_ahead', 7)
+        )
+        return {
+            "next_free_slot": slot.isoformat() if slot else None,
+            "success": slot is not None
+        }
+
+    def _tool_get_email_message(self, tool_input: Dict) -> Dict:
+        """Fetch a Gmail message by ID"""
+        return self._tool_get_email_messages([tool_input])[0]
+
+    def _tool_get_email_messages(self, tool_inputs: List[Dict]) -> List[Dict]:
+        """Fetch several Gmail messages with one batched request"""
+        message_ids = [tool_input['message_id'] for tool_input in tool_inputs]
+        found = self.gmail_tool.get_emails(message_ids)
+        return [
+            {"content": found[message_id]} if message_id in found
+            else {"error": f"Email {message_id} not found"}
+            for message_id in message_ids
+        ]
+
+    def _tool_get_calendar_event(self, tool_input: Dict) -> Dict:
+        """Fetch a Google Calendar event by ID"""
+        return self._tool_get_calendar_events([tool_input])[0]
+
+    def _tool_get_calendar_events(self, tool_inputs: List[Dict]) -> List[Dict]:
+        """Fetch several Google Calendar events with one batched request per calendar"""
+        keys = [(tool_input.get('calendar_id', 'primary'), tool_input['event_id']) for tool_input in tool_inputs]
+
+        event_ids_by_calendar: Dict[str, List[str]] = {}
+        for calendar_id, event_id in keys:
+            event_ids_by_calendar.setdefault(calendar_id, []).append(event_id)
+
+        found = {
+            calendar_id: self.gmail_tool.get_calendar_events(event_ids, calendar_id)
+            for calendar_id, event_ids in event_ids_by_calendar.items()
+        }
+        return [
+            found[calendar_id].get(event_id) or {"error": f"Calendar event {event_id} not found"}
+            for calendar_id, event_id in keys
+        ]
+
+    async def _load_profile(self, user_id: str) -> Optional[Dict]:
+        """
+        Get another user's profile, batched with concurrent lookups.
+
+        A room scan triggers many detections at once; their profile lookups
+        go to the MCP server as one batch request instead of one each.
+
+        Args:
+            user_id: User whose profile to fetch
+
+        Returns:
+            The profile, or None if the user doesn't exist
+
+        Raises:
+            MCPError: If the MCP lookup fails
+        """
+        return await _profile_batcher(self.mcp_client).load(user_id)
+
+    async def handle_new_person_nearby(
+        self,
+        other_user_id: str,
+        context: Dict,
+        outreach_mode: OutreachMode = "realtime"
+    ) -> Dict:
         """
         Handle when a new person is detected nearby
 
         Args:
             other_user_id: ID of the person detected
             context: Context about the detection (event, location, etc.)
+            outreach_mode: "realtime" drafts and sends an introduction now;
+                "batch" queues the draft on the Message Batches API for
+                detections that can wait (e.g. bulk introductions)
 
         Returns:
             dict with action taken and details
+
+        Raises:
+            ValueError: If outreach_mode is not "realtime" or "batch"
         """
-        # Get their profile
-        other_profile = self.mcp_client.get_user_profile(other_user_id)
+        if outreach_mode not in ("realtime", "batch"):
+            raise ValueError(f"Unknown outreach mode: {outreach_mode}")
+
+        # Get their profile, loading ours alongside it on first use.
+        # MCP calls block, so they run off the event loop.
+        _, other_profile = await asyncio.gather(
+            asyncio.to_thread(getattr, self, 'user_profile'),
+            self._load_profile(other_user_id)
+        )
 
         if not other_profile:
             return {'action': 'skip', 'reason': 'No profile found'}
 
         # Calculate match score
+        other_features = self.matching_engine.prepare_profile(other_profile)
         match_score = self.matching_engine.calculate_match_score(
-            self.user_profile,
-            other_profile
+            self._user_features,
+            other_features
         )
 
         is_high_match = self.matching_engine.is_high_match(match_score)
+        match_reason = self.matching_engine.get_match_reason(
+            self._user_features,
+            other_features,
+            match_score
+        )
 
         # Check permissions
-        can_auto_message = self.permissions_manager.can_auto_execute(
+        can_auto_message = await asyncio.to_thread(
+            self.permissions_manager.can_auto_execute,
             self.user_id,
             ActionType.SEND_MESSAGE,
             is_high_match
@@ -230,54 +711,201 @@ Remember: You represent {user_name}, so maintain their reputation and authentici
 
         if can_auto_message:
             # Autonomously reach out
-            return self._autonomous_outreach(other_user_id, other_profile, match_score, context)
+            return await self._autonomous_outreach(
+                other_user_id,
+                other_profile,
+                match_score,
+                match_reason,
+                context,
+                outreach_mode
+            )
         else:
             # Ask user for permission
             return {
                 'action': 'request_permission',
                 'other_user': other_profile,
                 'match_score': match_score,
-                'reason': self.matching_engine.get_match_reason(
-                    self.user_profile,
-                    other_profile,
-                    match_score
-                ),
+                'reason': match_reason,
                 'context': context
             }
 
-    def _autonomous_outreach(
+    async def _draft_message(self, prompt: str) -> str:
+        """
+        Draft a short message with a single Claude call.
+
+        No tools are offered, so drafting can never trigger a send or a
+        calendar change; the caller decides what to do with the text.
+
+        Args:
+            prompt: Drafting instructions
+
+        Returns:
+            The drafted message text
+
+        Raises:
+            anthropic.APIError: If the Claude request fails
+        """
+        response = await _shared_anthropic().messages.create(**await self._draft_params(prompt))
+        return ''.join(block.text for block in response.content if block.type == "text")
+
+    async def _draft_params(self, prompt: str) -> Dict:
+        """Request parameters for drafting a message, shared by real-time and batch drafting"""
+        system = await asyncio.to_thread(getattr, self, 'system_prompt')
+        return {
+            "model": CLAUDE_MODEL,
+            "max_tokens": _DRAFT_MAX_TOKENS,
+            "system": system,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+
+    async def _queue_draft(self, custom_id: str, prompt: str) -> str:
+        """
+        Queue a message draft on the Message Batches API.
+
+        Args:
+            custom_id: ID the batch result is reported under
+            prompt: Drafting instructions
+
+        Returns:
+            ID of the created message batch
+
+        Raises:
+            anthropic.APIError: If the batch cannot be created
+        """
+        batch = await _shared_anthropic().beta.messages.batches.create(
+            requests=[{"custom_id": custom_id, "params": await self._draft_params(prompt)}]
+        )
+        return batch.id
+
+    def _introduction_from_templates(
+        self,
+        templates: List[Dict],
+        other_profile: Dict,
+        match_score: float,
+        event_name: Optional[str]
+    ) -> Optional[str]:
+        """
+        Fill the first introduction template that applies to this match.
+
+        Args:
+            templates: Introduction templates from MCP
+            other_profile: Profile of the person being introduced to
+            match_score: Compatibility score for the match
+            event_name: Name of the event both people are at, if known
+
+        Returns:
+            The filled message, or None if no template applies or can be filled
+        """
+        shared_interests = set(self.user_profile.get('interests', [])) & set(other_profile.get('interests', []))
+        values = {
+            'name': other_profile.get('name'),
+            'my_name': self.user_profile.get('name'),
+            'role': other_profile.get('role'),
+            'interest': min(shared_interests) if shared_interests else None,
+            'event_name': event_name,
+        }
+
+        for template in templates:
+            threshold = (template.get('context') or {}).get('matchThreshold')
+            if threshold is not None and match_score < threshold:
+                continue
+
+            message = _fill_template(template.get('content', ''), values)
+            if message:
+                return message
+
+        return None
+
+    async def _autonomous_outreach(
         self,
         other_user_id: str,
         other_profile: Dict,
         match_score: float,
-        context: Dict
+        match_reason: str,
+        context: Dict,
+        outreach_mode: OutreachMode = "realtime"
     ) -> Dict:
         """Autonomously reach out to a high-match person"""
-
-        # Get message templates
-        templates = self.mcp_client.get_message_templates('introduction')
-
-        # Craft personalized message using Claude
-        match_reason = self.matching_engine.get_match_reason(
-            self.user_profile,
-            other_profile,
-            match_score
+        other_name = other_profile.get('name')
+        my_name = self.user_profile.get('name')
+        event_name = context.get('event_name')
+
+        # Use a canonical introduction template when one fits this match
+        templates = await asyncio.to_thread(
+            self.mcp_client.get_message_templates,
+            'introduction'
         )
-
-        prompt = f"""You're reaching out to {other_profile.get('name')} on behalf of {self.user_profile.get('name')}.
+        message = self._introduction_from_templates(templates, other_profile, match_score, event_name)
+
+        # Otherwise reuse a draft written for someone with the same profile
+        intro_profile = {field: other_profile.get(field) for field in _INTRO_PROFILE_FIELDS}
+        intro_key = (_compact_json(intro_profile), event_name)
+        if message is None:
+            cached_intro = self._intro_cache.get(intro_key)
+            if cached_intro is not None:
+                message = _fill_template(cached_intro, {
+                    'name': other_name,
+                    'first_name': other_name.split()[0] if other_name and other_name.split() else None,
+                })
+
+        if message is None:
+            # Craft personalized message using Claude
+            prompt = f"""You're reaching out to {other_name} on behalf of {my_name}.
 
 Context:
-- You're both at: {context.get('event_name', 'the same event')}
+- You're both at: {event_name or 'the same event'}
 - Match reason: {match_reason}
 - Match score: {match_score:.0%}
 
-{other_profile.get('name')}'s profile:
-{json.dumps(other_profile, indent=2)}
+{other_name}'s profile:
+{intro_key[0]}
 
-Craft a brief, friendly iMessage introduction (2-3 sentences max). Be authentic and mention the specific connection point."""
+Craft a brief, friendly iMessage introduction (2-3 sentences max). Be authentic and mention the specific connection point. Reply with the message text only."""
+
+            if outreach_mode == "batch":
+                # The batch result is sent later via _dispatch_outreach_message
+                batch_id = await self._queue_draft(other_user_id, prompt)
+                return {
+                    'action': 'queued_batch',
+                    'recipient': other_name,
+                    'batch_id': batch_id,
+                    'custom_id': other_user_id
+                }
 
-        response = self.run(prompt)
-        message = response.get('output', '')
+            message = await self._draft_message(prompt)
+            self._intro_cache.set(intro_key, _name_to_placeholder(message, other_name))
+
+        return await self._dispatch_outreach_message(
+            other_user_id,
+            other_profile,
+            message,
+            match_score,
+            context
+        )
+
+    async def _dispatch_outreach_message(
+        self,
+        other_user_id: str,
+        other_profile: Dict,
+        message: str,
+        match_score: float,
+        context: Dict
+    ) -> Dict:
+        """
+        Send an introduction over the best available channel and log it.
+
+        Args:
+            other_user_id: ID of the person being introduced to
+            other_profile: Their profile
+            message: Introduction text
+            match_score: Compatibility score for the match
+            context: Detection context (event, location, etc.)
+
+        Returns:
+            dict with the action taken and whether sending succeeded
+        """
+        other_name = other_profile.get('name')
+        event_name = context.get('event_name')
 
         # Determine contact method
         contact_info = other_profile.get('contact', {})
@@ -288,34 +916,40 @@ Craft a brief, friendly iMessage introduction (2-3 sentences max). Be authentic
 
         if phone:
             # Send iMessage
-            send_result = self.imessage_tool.send_message(phone, message)
+            send_result = await asyncio.to_thread(
+                self.imessage_tool.send_message,
+                phone,
+                message
+            )
             result = {
                 'action': 'sent_imessage',
-                'recipient': other_profile.get('name'),
+                'recipient': other_name,
                 'message': message,
                 'success': send_result.get('success', False)
             }
         elif email:
             # Send email
-            send_result = self.gmail_tool.send_email(
+            send_result = await asyncio.to_thread(
+                self.gmail_tool.send_email,
                 to=email,
-                subject=f"Great to connect at {context.get('event_name', 'the event')}!",
+                subject=f"Great to connect at {event_name or 'the event'}!",
                 body=message
             )
             result = {
                 'action': 'sent_email',
-                'recipient': other_profile.get('name'),
+                'recipient': other_name,
                 'message': message,
                 'success': send_result.get('success', False)
             }
         else:
             result = {
                 'action': 'no_contact_method',
-                'recipient': other_profile.get('name')
+                'recipient': other_name
             }
 
         # Log the interaction
-        self.mcp_client.log_interaction(
+        await asyncio.to_thread(
+            self.mcp_client.log_interaction,
             self.user_id,
             other_user_id,
             'autonomous_outreach',
@@ -324,57 +958,77 @@ Craft a brief, friendly iMessage introduction (2-3 sentences max). Be authentic
 
         return result
 
-    def handle_incoming_message(
+    async def handle_incoming_message(
         self,
         sender_id: str,
         message: str,
-        conversation_id: str
+        conversation_id: str,
+        on_text: Optional[Callable[[str], None]] = None
     ) -> Dict:
         """
         Handle an incoming message from someone
 
+        The reply is streamed, and generation stops as soon as Claude asks
+        the user to take over; the rest of that reply would not be used.
+
         Args:
             sender_id: ID of the sender
             message: Message content
             conversation_id: Conversation ID
+            on_text: Optional callback receiving reply text as it streams
 
         Returns:
             dict with response and actions
         """
-        # Get conversation history
-        history = self.mcp_client.get_conversation_history(conversation_id)
+        # Get the recent conversation history, the sender profile and (on first
+        # use) our own profile together. Only the most recent messages go into
+        # the prompt, so fetch just those. MCP calls block, so they run off the
+        # event loop.
+        history, sender_profile, user_profile = await asyncio.gather(
+            asyncio.to_thread(
+                self.mcp_client.get_conversation_history,
+                conversation_id,
+                limit=_PROMPT_HISTORY_LIMIT
+            ),
+            self._load_profile(sender_id),
+            asyncio.to_thread(getattr, self, 'user_profile')
+        )
+        # The MCP server returns newest first; flip to chronological order
+        history.reverse()
 
-        # Get sender profile
-        sender_profile = self.mcp_client.get_user_profile(sender_id)
+        sender_name = sender_profile.get('name', 'someone') if sender_profile else 'someone'
+        my_name = user_profile.get('name')
 
         # Save incoming message
-        self.mcp_client.save_conversation_message(
+        await asyncio.to_thread(
+            self.mcp_client.save_conversation_message,
             conversation_id,
             sender_id,
             message
         )
 
         # Analyze and respond using Claude
-        prompt = f"""You received a message from {sender_profile.get('name', 'someone')}:
+        prompt = f"""You received a message from {sender_name}:
 
 "{message}"
 
 Conversation history:
-{json.dumps(history[-5:], indent=2) if history else 'First message'}
+{_format_history(history, {sender_id: sender_name, self.user_id: my_name}) if history else 'First message'}
 
 Analyze the message and decide:
-1. Should you respond, or ask {self.user_profile.get('name')} to take over?
+1. Should you respond, or ask {my_name} to take over?
 2. If responding, what should you say?
 3. Is this a good time to suggest meeting in person?
 4. Any actions to take (schedule meeting, etc.)?
 
 Respond naturally and keep building the relationship."""
 
-        response = self.run(prompt)
+        response = await self.arun(prompt, on_text=on_text, stop_on=_TAKEOVER_RE)
 
         # Save outgoing response
         output = response.get('output', '')
-        self.mcp_client.save_conversation_message(
+        await asyncio.to_thread(
+            self.mcp_client.save_conversation_message,
             conversation_id,
             self.user_id,
             output,
@@ -383,20 +1037,99 @@ Respond naturally and keep building the relationship."""
 
         return {
             'response': output,
-            'should_notify_user': 'take over' in output.lower(),
+            'should_notify_user': bool(_TAKEOVER_RE.search(output)),
             'conversation_id': conversation_id
         }
 
-    def run(self, task: str, chat_history: Optional[List[Dict]] = None) -> Dict:
+    async def _stream_turn(
+        self,
+        client: AsyncAnthropic,
+        system: List[Dict],
+        messages: List[Dict],
+        run_tool: Callable[[str, Dict], "asyncio.Future[Dict]"],
+        on_text: Optional[Callable[[str], None]] = None,
+        stop_on: Optional[re.Pattern] = None
+    ) -> Tuple[Message, List[Tuple[str, "asyncio.Future[Dict]"]]]:
+        """
+        Stream one Claude turn, starting each tool call as soon as its block completes
+
+        Tool calls are I/O bound, so they run concurrently while Claude is
+        still generating the rest of the turn instead of after the full
+        response has arrived.
+
+        If stop_on matches the text generated so far and no tool call has
+        been started in this turn, generation is cut short and the partial
+        message is returned with a stop_reason of None.
+
+        Args:
+            client: Anthropic client for the running event loop
+            system: System prompt content blocks
+            messages: Conversation so far
+            run_tool: Starts or queues a tool call and returns its future
+            on_text: Optional callback receiving text deltas as they arrive
+            stop_on: Optional pattern that ends generation early
+
+        Returns:
+            Tuple of the final (or partial) message and (tool_use_id, future)
+            pairs in the order Claude emitted the tool_use blocks
+
+        Raises:
+            anthropic.APIError: If the Claude request fails
+        """
+        pending_tools = []
+        add_pending = pending_tools.append
+
+        async with client.messages.stream(
+            model=CLAUDE_MODEL,
+            max_tokens=4096,
+            system=system,
+            tools=_CLAUDE_TOOL_SCHEMAS,
+            messages=messages
+        ) as stream:
+            async for event in stream:
+                if event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                    block = event.content_block
+                    add_pending((block.id, run_tool(block.name, block.input)))
+
+                elif event.type == "text":
+                    if on_text is not None:
+                        on_text(event.text)
+                    # Only the tail can hold a new match; search from a little
+                    # before the delta so a phrase split across deltas is found
+                    if (
+                        stop_on is not None
+                        and not pending_tools
+                        and stop_on.search(event.snapshot, max(0, len(event.snapshot) - len(event.text) - 16))
+                    ):
+                        # Leaving the context manager closes the connection
+                        return stream.current_message_snapshot, pending_tools
+
+            response = await stream.get_final_message()
+
+        return response, pending_tools
+
+    async def arun(
+        self,
+        task: str,
+        chat_history: Optional[List[Dict]] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+        stop_on: Optional[re.Pattern] = None
+    ) -> Dict:
         """
         Run the agent with a specific task using Claude's tool calling
 
         Args:
             task: Task description
             chat_history: Optional conversation history
+            on_text: Optional callback receiving response text as it streams
+            stop_on: Optional pattern; once the response text matches it,
+                generation stops and the partial text is returned
 
         Returns:
             dict with results
+
+        Raises:
+            anthropic.APIError: If a Claude request fails
         """
         messages = []
 
@@ -410,54 +1143,141 @@ Respond naturally and keep building the relationship."""
             "content": task
         })
 
-        # Call Claude with tool use
-        response = self.anthropic.messages.create(
-            model=Config.CLAUDE_MODEL,
-            max_tokens=4096,
-            system=self._get_system_prompt(),
-            tools=self.tools,
-            messages=messages
-        )
-
-        # Process tool uses
-        while response.stop_reason == "tool_use":
-            # Extract tool uses from response
-            tool_results = []
-
-            for content_block in response.content:
-                if content_block.type == "tool_use":
-                    tool_name = content_block.name
-                    tool_input = content_block.input
-                    tool_use_id = content_block.id
-
-                    # Execute the tool
-                    result = self._execute_tool(tool_name, tool_input)
+        # Tools are blocking calls; run them on worker threads, at most
+        # _MAX_PARALLEL_TOOLS at a time
+        tool_slots = asyncio.Semaphore(_MAX_PARALLEL_TOOLS)
+        side_effects = asyncio.Lock()
+        execute = self._execute_tool
+        batchable = self._batch_tool_dispatch
+        loop = asyncio.get_running_loop()
+
+        # Calls to batchable tools wait until the turn has finished streaming
+        # and are then served together
+        batched: Dict[str, List[Tuple[Dict, "asyncio.Future[Dict]"]]] = {}
+
+        # Tool tasks still running; the event loop only keeps weak references
+        # to tasks, so they are held here until done
+        tasks: Set["asyncio.Task"] = set()
+
+        def spawn(coro: Awaitable[Dict]) -> "asyncio.Task":
+            task = asyncio.ensure_future(coro)
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            return task
+
+        async def call_tool(tool_name: str, tool_input: Dict) -> Dict:
+            async with tool_slots:
+                return await asyncio.to_thread(execute, tool_name, tool_input)
+
+        async def call_sequential_tool(tool_name: str, tool_input: Dict) -> Dict:
+            # The lock is FIFO, so calls run in the order they were started
+            async with side_effects:
+                return await call_tool(tool_name, tool_input)
+
+        async def call_batch(tool_name: str, calls: List[Tuple[Dict, "asyncio.Future[Dict]"]]) -> None:
+            # Every future gets an outcome, or the gather on the turn's tool
+            # results would wait forever
+            try:
+                async with tool_slots:
+                    outputs = await asyncio.to_thread(
+                        self._execute_tool_batch,
+                        tool_name,
+                        [tool_input for tool_input, _ in calls]
+                    )
+            except asyncio.CancelledError:
+                for _, future in calls:
+                    future.cancel()
+                raise
+            except Exception as e:
+                for _, future in calls:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for (_, future), output in zip(calls, outputs):
+                if not future.done():
+                    future.set_result(output)
+            for _, future in calls[len(outputs):]:
+                if not future.done():
+                    future.set_exception(RuntimeError(f"{tool_name} returned no result for this call"))
+
+        def run_tool(tool_name: str, tool_input: Dict) -> "asyncio.Future[Dict]":
+            if tool_name in batchable:
+                future = loop.create_future()
+                batched.setdefault(tool_name, []).append((tool_input, future))
+                return future
+            if tool_name in _SEQUENTIAL_TOOLS:
+                return spawn(call_sequential_tool(tool_name, tool_input))
+            return spawn(call_tool(tool_name, tool_input))
+
+        def flush_batches() -> None:
+            for tool_name, calls in batched.items():
+                spawn(call_batch(tool_name, calls))
+            batched.clear()
+
+        # Bound once; the tool-use loop below only does local lookups
+        client = _shared_anthropic()
+        system = await asyncio.to_thread(getattr, self, '_system_blocks')
+        stream_turn = self._stream_turn
+        append = messages.append
+        dumps = _compact_json
 
-                    tool_results.append({
+        try:
+            # Call Claude with tool use
+            response, pending_tools = await stream_turn(client, system, messages, run_tool, on_text, stop_on)
+            flush_batches()
+
+            # The prefix up to the latest tool results is resent unchanged on the
+            # next turn; a rolling cache breakpoint on its last block lets Claude
+            # reuse it. Only the newest block keeps the marker, which stays within
+            # the API's limit of four breakpoints next to the tools and system ones.
+            cache_tail: Optional[Dict] = None
+
+            # Process tool uses
+            while response.stop_reason == "tool_use":
+                # Tools were started as their blocks finished streaming;
+                # gather the results in the order Claude emitted them
+                outputs = await asyncio.gather(*(future for _, future in pending_tools))
+                tool_results = [
+                    {
                         "type": "tool_result",
                         "tool_use_id": tool_use_id,
-                        "content": json.dumps(result)
-                    })
-
-            # Add assistant response and tool results to messages
-            messages.append({
-                "role": "assistant",
-                "content": response.content
-            })
-
-            messages.append({
-                "role": "user",
-                "content": tool_results
-            })
-
-            # Continue the conversation
-            response = self.anthropic.messages.create(
-                model=Config.CLAUDE_MODEL,
-                max_tokens=4096,
-                system=self._get_system_prompt(),
-                tools=self.tools,
-                messages=messages
-            )
+                        "content": dumps(output)
+                    }
+                    for (tool_use_id, _), output in zip(pending_tools, outputs)
+                ]
+
+                if cache_tail is not None:
+                    del cache_tail["cache_control"]
+                cache_tail = tool_results[-1]
+                cache_tail["cache_control"] = _EPHEMERAL_CACHE
+
+                # Add assistant response and tool results to messages
+                append({
+                    "role": "assistant",
+                    "content": _content_params(response.content)
+                })
+
+                append({
+                    "role": "user",
+                    "content": tool_results
+                })
+
+                # Continue the conversation
+                response, pending_tools = await stream_turn(client, system, messages, run_tool, on_text, stop_on)
+                flush_batches()
+        finally:
+            # A failed turn can leave tool calls behind: batch calls queued
+            # but never flushed, and tasks still in flight
+            for calls in batched.values():
+                for _, future in calls:
+                    future.cancel()
+            batched.clear()
+            leftover = list(tasks)
+            for task in leftover:
+                task.cancel()
+            if leftover:
+                await asyncio.gather(*leftover, return_exceptions=True)
 
         # Extract final text response
         final_response = ""
@@ -470,3 +1290,103 @@ Respond naturally and keep building the relationship."""
             "messages": messages,
             "response": response
         }
+
+    def run(self, task: str, chat_history: Optional[List[Dict]] = None) -> Dict:
+        """
+        Synchronous wrapper around ``arun`` for legacy callers
+
+        Async code should await ``arun`` directly. If this is called from
+        inside a running event loop anyway, the run gets its own loop on a
+        worker thread, because asyncio.run cannot nest.
+
+        Args:
+            task: Task description
+            chat_history: Optional conversation history
+
+        Returns:
+            dict with results
+
+        Raises:
+            anthropic.APIError: If a Claude request fails
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.arun(task, chat_history))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.arun(task, chat_history)).result()
+
+
+# Agents kept alive at once; each holds little beyond the user's profile
+_MAX_AGENTS = 10_000
+
+# Seconds an agent serves its cached profile, preferences and system prompt
+# before refetching them. A PATCH refreshes the agent only in the worker that
+# served it, so this bounds how long other gunicorn workers stay stale.
+_AGENT_PROFILE_TTL = 60.0
+
+# Shared agents by user with the monotonic time their profile was last
+# refreshed, least recently used first
+_AGENTS: "OrderedDict[str, Tuple[float, SociusAgent]]" = OrderedDict()
+
+# get_agent runs on the event loop and on FastAPI worker threads. Building
+# an agent does no I/O, so one lock held across lookup-or-create is cheap
+# and guarantees a single agent per user.
+_AGENTS_LOCK = threading.Lock()
+
+
+def get_agent(user_id: str) -> SociusAgent:
+    """
+    Get the shared agent for a user, creating it on first use
+
+    Agents hold the user's profile, preferences and client connections, so
+    one instance per user is reused across requests instead of being
+    rebuilt each time. An agent whose profile is older than
+    _AGENT_PROFILE_TTL is refreshed before it is returned. The least recently
+    used agents are dropped once more than _MAX_AGENTS users are cached.
+
+    Args:
+        user_id: User the agent acts for
+
+    Returns:
+        The cached SociusAgent for user_id
+    """
+    now = time.monotonic()
+    with _AGENTS_LOCK:
+        entry = _AGENTS.get(user_id)
+        if entry is not None:
+            refreshed_at, agent = entry
+            if now - refreshed_at >= _AGENT_PROFILE_TTL:
+                # Only drops cached attributes; the next access refetches them
+                agent.refresh_profile()
+                _AGENTS[user_id] = (now, agent)
+            _AGENTS.move_to_end(user_id)
+            return agent
+
+        agent = SociusAgent(user_id)
+        _AGENTS[user_id] = (now, agent)
+        if len(_AGENTS) > _MAX_AGENTS:
+            _AGENTS.popitem(last=False)
+        return agent
+
+
+def peek_agent(user_id: str) -> Optional[SociusAgent]:
+    """
+    Get a user's cached agent without creating one or marking it as recently used
+
+    Args:
+        user_id: User the agent acts for
+
+    Returns:
+        The cached SociusAgent, or None if the user has none
+    """
+    with _AGENTS_LOCK:
+        entry = _AGENTS.get(user_id)
+    return entry[1] if entry is not None else None
+
+
+def invalidate_agents() -> None:
+    """Drop all cached agents so the next get_agent call rebuilds them"""
+    with _AGENTS_LOCK:
+        _AGENTS.clear()
@@ -1,8 +1,74 @@
 """
 Interest-based matching algorithm
 """
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
 import json
+import re
+import sys
+
+
+SENIORITY_LEVELS = ('junior', 'mid', 'senior', 'lead', 'manager', 'director', 'vp', 'c-level')
+
+_SENIORITY_INDEX = {level: i for i, level in enumerate(SENIORITY_LEVELS)}
+_SENIORITY_RE = re.compile(r'\b(' + '|'.join(re.escape(level) for level in SENIORITY_LEVELS) + r')\b')
+
+
+def _seniority_level(seniority: Optional[str]) -> int:
+    """
+    Index of a seniority description in SENIORITY_LEVELS.
+
+    Levels are matched as whole words. If a description names several
+    levels (e.g. "Senior Manager"), the earliest one in SENIORITY_LEVELS wins.
+
+    Args:
+        seniority: Free-text seniority from a profile (None or empty if unset)
+
+    Returns:
+        Level index, or -1 if no level is named
+    """
+    if not seniority:
+        return -1
+    levels = _SENIORITY_RE.findall(seniority.lower())
+    return min(_SENIORITY_INDEX[level] for level in levels) if levels else -1
+
+
+def _norm(value: str) -> str:
+    """
+    Normalize a profile string for comparison and intern it.
+
+    Profiles at one event repeat the same interests and keywords; interned
+    strings are shared between profiles and compare by identity first in
+    set operations.
+    """
+    return sys.intern(value.strip().lower())
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileFeatures:
+    """
+    Normalized profile fields used for scoring.
+
+    Built once per profile with ``MatchingEngine.prepare_profile`` so that
+    scoring the same person against many others does not re-lowercase and
+    re-tokenize their profile on every comparison.
+    """
+    interests: FrozenSet[str]
+    industry: str
+    industry_lower: str
+    industry_tokens: FrozenSet[str]
+    role: str
+    role_lower: str
+    role_words: Tuple[str, ...]
+    seniority_level: int
+    goals_tokens: FrozenSet[str]
+
+
+# Sum of the component weights in calculate_match_score
+_TOTAL_WEIGHT = 0.4 + 0.3 + 0.2 + 0.1
+
+# A raw profile dict or its precomputed features
+ProfileLike = Union[Dict, ProfileFeatures]
 
 
 class MatchingEngine:
@@ -11,132 +77,167 @@ class MatchingEngine:
     def __init__(self, high_match_threshold: float = 0.75):
         self.high_match_threshold = high_match_threshold
 
-    def calculate_match_score(self, user1_profile: Dict, user2_profile: Dict) -> float:
+    @staticmethod
+    def prepare_profile(profile: ProfileLike) -> ProfileFeatures:
+        """
+        Precompute the normalized fields used for scoring a profile
+
+        Args:
+            profile: User profile data (already prepared features are returned as is)
+
+        Returns:
+            ProfileFeatures for the profile
+        """
+        if isinstance(profile, ProfileFeatures):
+            return profile
+
+        # Sanity returns null for unset fields, so fall back on falsy values too
+        industry = profile.get('industry') or ''
+        role = profile.get('role') or ''
+
+        return ProfileFeatures(
+            interests=frozenset(_norm(i) for i in profile.get('interests') or ()),
+            industry=industry,
+            industry_lower=industry.lower(),
+            industry_tokens=frozenset(_norm(t) for t in industry.split()),
+            role=role,
+            role_lower=role.lower(),
+            role_words=tuple(_norm(w) for w in role.split()),
+            seniority_level=_seniority_level(profile.get('seniority')),
+            goals_tokens=frozenset(_norm(t) for goal in profile.get('goals') or () for t in goal.split()),
+        )
+
+    def calculate_match_score(
+        self,
+        user1_profile: ProfileLike,
+        user2_profile: ProfileLike,
+        min_threshold: Optional[float] = None
+    ) -> float:
         """
         Calculate compatibility score between two users
 
+        With min_threshold set, scoring stops as soon as the remaining
+        components can no longer lift the score to the threshold. The
+        partial score returned then is below min_threshold but is not the
+        exact score, so only pass it when the caller just filters on it.
+
         Args:
-            user1_profile: First user's profile data
-            user2_profile: Second user's profile data
+            user1_profile: First user's profile data or prepared features
+            user2_profile: Second user's profile data or prepared features
+            min_threshold: Optional score below which the exact value is not needed
 
         Returns:
             float between 0 and 1 indicating match quality
         """
+        user1 = self.prepare_profile(user1_profile)
+        user2 = self.prepare_profile(user2_profile)
+
+        # Cheapest and most decisive components first:
+        # interests 0.4, industry 0.3, role/seniority 0.2, goals 0.1
+        components = (
+            (self._calculate_interest_overlap, 0.4),
+            (self._calculate_industry_match, 0.3),
+            (self._calculate_role_compatibility, 0.2),
+            (self._calculate_goals_alignment, 0.1),
+        )
+
         score = 0.0
         weights_sum = 0.0
+        remaining = _TOTAL_WEIGHT
 
-        # Interest overlap (weight: 0.4)
-        interest_score = self._calculate_interest_overlap(
-            user1_profile.get('interests', []),
-            user2_profile.get('interests', [])
-        )
-        score += interest_score * 0.4
-        weights_sum += 0.4
+        for calculate, weight in components:
+            score += calculate(user1, user2) * weight
+            weights_sum += weight
+            remaining -= weight
 
-        # Industry/field match (weight: 0.3)
-        industry_score = self._calculate_industry_match(
-            user1_profile.get('industry', ''),
-            user2_profile.get('industry', '')
-        )
-        score += industry_score * 0.3
-        weights_sum += 0.3
-
-        # Role/seniority compatibility (weight: 0.2)
-        role_score = self._calculate_role_compatibility(
-            user1_profile.get('role', ''),
-            user2_profile.get('role', ''),
-            user1_profile.get('seniority', ''),
-            user2_profile.get('seniority', '')
-        )
-        score += role_score * 0.2
-        weights_sum += 0.2
-
-        # Goals alignment (weight: 0.1)
-        goals_score = self._calculate_goals_alignment(
-            user1_profile.get('goals', []),
-            user2_profile.get('goals', [])
-        )
-        score += goals_score * 0.1
-        weights_sum += 0.1
+            # Every component scores at most 1, so this is the best case; the
+            # slack keeps float rounding from cutting off a score at the threshold
+            if min_threshold is not None and (score + remaining) / _TOTAL_WEIGHT < min_threshold - 1e-9:
+                return score / _TOTAL_WEIGHT
 
         # Normalize score
         return score / weights_sum if weights_sum > 0 else 0.0
 
-    def _calculate_interest_overlap(self, interests1: List[str], interests2: List[str]) -> float:
-        """Calculate overlap between interest lists"""
-        if not interests1 or not interests2:
-            return 0.0
+    def calculate_match_scores(
+        self,
+        user_profile: ProfileLike,
+        candidates: List[ProfileLike],
+        min_threshold: Optional[float] = None
+    ) -> List[float]:
+        """
+        Score one user against many candidates, e.g. everyone detected in a room
+
+        The user's profile is prepared once for the whole batch instead of
+        once per candidate.
 
-        set1 = set(i.lower() for i in interests1)
-        set2 = set(i.lower() for i in interests2)
+        Args:
+            user_profile: The user's profile data or prepared features
+            candidates: Candidate profiles or prepared features
+            min_threshold: Optional early-exit threshold, as in calculate_match_score
 
-        intersection = len(set1 & set2)
-        union = len(set1 | set2)
+        Returns:
+            Scores in the same order as candidates
+        """
+        user = self.prepare_profile(user_profile)
+        prepare = self.prepare_profile
+        score = self.calculate_match_score
+        return [score(user, prepare(candidate), min_threshold) for candidate in candidates]
+
+    def _calculate_interest_overlap(self, user1: ProfileFeatures, user2: ProfileFeatures) -> float:
+        """Calculate overlap between interest sets"""
+        if not user1.interests or not user2.interests:
+            return 0.0
+
+        # Union size from the set sizes, without building the union set
+        intersection = len(user1.interests & user2.interests)
+        union = len(user1.interests) + len(user2.interests) - intersection
 
         return intersection / union if union > 0 else 0.0
 
-    def _calculate_industry_match(self, industry1: str, industry2: str) -> float:
+    def _calculate_industry_match(self, user1: ProfileFeatures, user2: ProfileFeatures) -> float:
         """Calculate industry match score"""
-        if not industry1 or not industry2:
+        if not user1.industry or not user2.industry:
             return 0.0
 
         # Exact match
-        if industry1.lower() == industry2.lower():
+        if user1.industry_lower == user2.industry_lower:
             return 1.0
 
         # Uses keyword matching to find related industries
-        keywords1 = set(industry1.lower().split())
-        keywords2 = set(industry2.lower().split())
-
-        overlap = len(keywords1 & keywords2)
+        overlap = len(user1.industry_tokens & user2.industry_tokens)
         return min(overlap / 3, 0.7) if overlap > 0 else 0.0
 
-    def _calculate_role_compatibility(
-        self,
-        role1: str,
-        role2: str,
-        seniority1: str,
-        seniority2: str
-    ) -> float:
+    def _calculate_role_compatibility(self, user1: ProfileFeatures, user2: ProfileFeatures) -> float:
         """Calculate role and seniority compatibility"""
         score = 0.0
 
         # Same role type gets points
-        if role1 and role2:
-            if role1.lower() == role2.lower():
+        if user1.role and user2.role:
+            if user1.role_lower == user2.role_lower:
                 score += 0.5
-            elif any(word in role2.lower() for word in role1.lower().split()):
+            elif any(word in user2.role_lower for word in user1.role_words):
                 score += 0.3
 
         # Similar seniority gets points (peer networking)
-        seniority_levels = ['junior', 'mid', 'senior', 'lead', 'manager', 'director', 'vp', 'c-level']
-
-        if seniority1 and seniority2:
-            level1 = next((i for i, level in enumerate(seniority_levels) if level in seniority1.lower()), -1)
-            level2 = next((i for i, level in enumerate(seniority_levels) if level in seniority2.lower()), -1)
-
-            if level1 >= 0 and level2 >= 0:
-                diff = abs(level1 - level2)
-                if diff == 0:
-                    score += 0.5
-                elif diff == 1:
-                    score += 0.3
-                elif diff == 2:
-                    score += 0.1
+        if user1.seniority_level >= 0 and user2.seniority_level >= 0:
+            diff = abs(user1.seniority_level - user2.seniority_level)
+            if diff == 0:
+                score += 0.5
+            elif diff == 1:
+                score += 0.3
+            elif diff == 2:
+                score += 0.1
 
         return min(score, 1.0)
 
-    def _calculate_goals_alignment(self, goals1: List[str], goals2: List[str]) -> float:
+    def _calculate_goals_alignment(self, user1: ProfileFeatures, user2: ProfileFeatures) -> float:
         """Calculate alignment between user goals"""
-        if not goals1 or not goals2:
+        if not user1.goals_tokens or not user2.goals_tokens:
             return 0.0
 
         # Simple keyword overlap
-        set1 = set(' '.join(goals1).lower().split())
-        set2 = set(' '.join(goals2).lower().split())
-
-        intersection = len(set1 & set2)
-        union = len(set1 | set2)
+        intersection = len(user1.goals_tokens & user2.goals_tokens)
+        union = len(user1.goals_tokens) + len(user2.goals_tokens) - intersection
 
         return intersection / union if union > 0 else 0.0
 
@@ -144,36 +245,36 @@ class MatchingEngine:
         """Determine if a match score is high enough for autonomous action"""
         return score >= self.high_match_threshold
 
-    def get_match_reason(self, user1_profile: Dict, user2_profile: Dict, score: float) -> str:
+    def get_match_reason(self, user1_profile: ProfileLike, user2_profile: ProfileLike, score: float) -> str:
         """
         Generate a human-readable explanation of why users match
 
         Args:
-            user1_profile: First user's profile
-            user2_profile: Second user's profile
+            user1_profile: First user's profile or prepared features
+            user2_profile: Second user's profile or prepared features
             score: Match score
 
         Returns:
             String explanation of the match
         """
+        user1 = self.prepare_profile(user1_profile)
+        user2 = self.prepare_profile(user2_profile)
         reasons = []
 
         # Check interests
-        interests1 = set(i.lower() for i in user1_profile.get('interests', []))
-        interests2 = set(i.lower() for i in user2_profile.get('interests', []))
-        common_interests = interests1 & interests2
+        common_interests = user1.interests & user2.interests
 
         if common_interests:
             reasons.append(f"shared interests in {', '.join(list(common_interests)[:3])}")
 
         # Check industry
-        if user1_profile.get('industry', '').lower() == user2_profile.get('industry', '').lower():
-            reasons.append(f"both work in {user1_profile.get('industry')}")
+        if user1.industry and user1.industry_lower == user2.industry_lower:
+            reasons.append(f"both work in {user1.industry}")
 
         # Check role
-        if user1_profile.get('role') and user2_profile.get('role'):
-            if user1_profile['role'].lower() == user2_profile['role'].lower():
-                reasons.append(f"similar roles as {user1_profile['role']}")
+        if user1.role and user2.role:
+            if user1.role_lower == user2.role_lower:
+                reasons.append(f"similar roles as {user1.role}")
 
         if not reasons:
             return "potential synergy based on your profiles"
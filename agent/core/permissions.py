@@ -1,17 +1,29 @@
 """
 Smart permissions system that learns user preferences
 """
-from typing import Dict, Optional
-from enum import Enum
+from typing import Dict, Optional, Tuple
+from enum import Enum, IntEnum
 
+from ttl_cache import TTLCache
 
-class ActionType(Enum):
-    """Types of actions the agent can take"""
-    SEND_MESSAGE = "send_message"
-    SCHEDULE_MEETING = "schedule_meeting"
-    SEND_EMAIL = "send_email"
-    SHARE_PROFILE = "share_profile"
-    REQUEST_CONNECTION = "request_connection"
+
+class ActionType(IntEnum):
+    """
+    Types of actions the agent can take
+
+    Values are consecutive indexes into resolved permission tuples;
+    ``key`` is the name the action is stored under in MCP preferences.
+    """
+    SEND_MESSAGE = 0
+    SCHEDULE_MEETING = 1
+    SEND_EMAIL = 2
+    SHARE_PROFILE = 3
+    REQUEST_CONNECTION = 4
+
+    @property
+    def key(self) -> str:
+        """Preference key for the action, e.g. send_message"""
+        return _ACTION_KEYS[self]
 
 
 class PermissionLevel(Enum):
@@ -22,20 +34,57 @@ class PermissionLevel(Enum):
     NEVER = "never"
 
 
+# Preference keys indexed by ActionType
+_ACTION_KEYS: Tuple[str, ...] = tuple(action_type.name.lower() for action_type in ActionType)
+
+# Stored preference strings resolved without constructing enums per call
+_LEVELS_BY_VALUE = {level.value: level for level in PermissionLevel}
+
+# Resolved permissions: one PermissionLevel per ActionType, indexed by it
+Permissions = Tuple[PermissionLevel, ...]
+
+# Default permission for each action, indexed by ActionType
+_DEFAULT_PERMISSIONS: Permissions = (
+    PermissionLevel.AUTO_HIGH_MATCH,  # SEND_MESSAGE
+    PermissionLevel.ALWAYS_ASK,       # SCHEDULE_MEETING
+    PermissionLevel.AUTO_HIGH_MATCH,  # SEND_EMAIL
+    PermissionLevel.ALWAYS_AUTO,      # SHARE_PROFILE
+    PermissionLevel.AUTO_HIGH_MATCH,  # REQUEST_CONNECTION
+)
+
+# Whether each level allows auto-execution, indexed by is_high_match
+_AUTO_EXECUTE = {
+    PermissionLevel.ALWAYS_ASK: (False, False),
+    PermissionLevel.AUTO_HIGH_MATCH: (False, True),
+    PermissionLevel.ALWAYS_AUTO: (True, True),
+    PermissionLevel.NEVER: (False, False),
+}
+
+
 class PermissionsManager:
     """Manages user permissions and learns preferences"""
 
-    def __init__(self, mcp_client):
+    def __init__(self, mcp_client, cache_ttl: float = 60.0):
+        """
+        Initialize the permissions manager.
+
+        Args:
+            mcp_client: MCP client used to read and write preferences
+            cache_ttl: Seconds resolved permissions are reused before
+                preferences are fetched from MCP again
+
+        Raises:
+            ValueError: If cache_ttl is not positive
+        """
         self.mcp_client = mcp_client
-        self.default_permissions = {
-            ActionType.SEND_MESSAGE: PermissionLevel.AUTO_HIGH_MATCH,
-            ActionType.SCHEDULE_MEETING: PermissionLevel.ALWAYS_ASK,
-            ActionType.SEND_EMAIL: PermissionLevel.AUTO_HIGH_MATCH,
-            ActionType.SHARE_PROFILE: PermissionLevel.ALWAYS_AUTO,
-            ActionType.REQUEST_CONNECTION: PermissionLevel.AUTO_HIGH_MATCH,
-        }
-
-    def get_user_permissions(self, user_id: str) -> Dict[ActionType, PermissionLevel]:
+        # Checked for every nearby person, but only changed by update_permission
+        self._permissions_cache: TTLCache[Permissions] = TTLCache(
+            maxsize=1024,
+            ttl=cache_ttl
+        )
+        self.default_permissions = _DEFAULT_PERMISSIONS
+
+    def get_user_permissions(self, user_id: str) -> Permissions:
         """
         Get user's permission settings from MCP
 
@@ -43,25 +92,34 @@ class PermissionsManager:
             user_id: User ID
 
         Returns:
-            dict mapping action types to permission levels
+            tuple of permission levels, indexed by ActionType
         """
+        cached = self._permissions_cache.get(user_id)
+        if cached is not None:
+            return cached
+
         prefs = self.mcp_client.get_user_preferences(user_id)
         permissions = prefs.get('permissions', {})
 
-        # Convert string keys back to enums
-        result = {}
-        for action_type in ActionType:
-            perm_str = permissions.get(action_type.value)
-            if perm_str:
-                try:
-                    result[action_type] = PermissionLevel(perm_str)
-                except ValueError:
-                    result[action_type] = self.default_permissions[action_type]
-            else:
-                result[action_type] = self.default_permissions[action_type]
+        # Convert stored strings back to enums, falling back to the default
+        # for missing or unrecognised values
+        result = tuple(
+            _LEVELS_BY_VALUE.get(permissions.get(key), default)
+            for key, default in zip(_ACTION_KEYS, self.default_permissions)
+        )
 
+        self._permissions_cache.set(user_id, result)
         return result
 
+    def invalidate_user_permissions(self, user_id: str) -> None:
+        """
+        Drop a user's cached permissions so the next check reads MCP again.
+
+        Args:
+            user_id: User ID
+        """
+        self._permissions_cache.invalidate(user_id)
+
     def can_auto_execute(
         self,
         user_id: str,
@@ -79,17 +137,8 @@ class PermissionsManager:
         Returns:
             bool indicating if auto-execution is allowed
         """
-        permissions = self.get_user_permissions(user_id)
-        permission_level = permissions.get(action_type, PermissionLevel.ALWAYS_ASK)
-
-        if permission_level == PermissionLevel.NEVER:
-            return False
-        elif permission_level == PermissionLevel.ALWAYS_AUTO:
-            return True
-        elif permission_level == PermissionLevel.AUTO_HIGH_MATCH:
-            return is_high_match
-        else:  # ALWAYS_ASK
-            return False
+        permission_level = self.get_user_permissions(user_id)[action_type]
+        return _AUTO_EXECUTE[permission_level][bool(is_high_match)]
 
     def update_permission(
         self,
@@ -109,14 +158,17 @@ class PermissionsManager:
             bool indicating success
         """
         prefs = self.mcp_client.get_user_preferences(user_id)
-        permissions = prefs.get('permissions', {})
+        # Copied: the preferences may be the MCP client's cached object
+        permissions = dict(prefs.get('permissions', {}))
 
-        permissions[action_type.value] = permission_level.value
+        permissions[action_type.key] = permission_level.value
 
-        return self.mcp_client.update_user_preferences(
+        success = self.mcp_client.update_user_preferences(
             user_id,
             {'permissions': permissions}
         )
+        self.invalidate_user_permissions(user_id)
+        return success
 
     def log_permission_response(
         self,
@@ -149,10 +201,10 @@ class PermissionsManager:
         return self.mcp_client.log_interaction(
             user_id=user_id,
             other_user_id=context.get('other_user_id', '') if context else '',
-            interaction_type=f"permission_{action_type.value}",
+            interaction_type=f"permission_{action_type.key}",
             metadata={
                 'approved': was_approved,
-                'action_type': action_type.value,
+                'action_type': action_type.key,
                 'context': context or {}
             }
         )
@@ -0,0 +1,30 @@
+"""
+Gunicorn settings for running the Socius Agent API in production
+
+Usage:
+    gunicorn main:app -c gunicorn.conf.py
+
+Each worker is a separate process with its own agent registry and TTL
+caches, so cached profiles and agents are per worker.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+
+# Uvicorn workers pick up uvloop and httptools when installed (uvicorn[standard])
+worker_class = 'uvicorn.workers.UvicornWorker'
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# Import the app once in the master so config validation and module setup
+# run before forking instead of once per worker. Nothing opens sockets or
+# files at import time; clients are created in each worker's lifespan.
+preload_app = True
+
+# Recycle workers periodically; jitter keeps them from restarting together
+max_requests = 1000
+max_requests_jitter = 50
+keepalive = 5
+
+# Access logging costs a write per request; enable it when debugging
+accesslog = '-' if os.getenv('ACCESS_LOG', 'false').lower() == 'true' else None
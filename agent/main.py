@@ -2,26 +2,137 @@
 Socius Agent API Server
 FastAPI server exposing the AI agent functionality
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict, List
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict
+from typing import Any, AsyncIterator, Iterator, Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime
+import asyncio
+import json
+import logging
+import time
+import anyio.to_thread
 import uvicorn
 
-from config import Config
-from core.agent import SociusAgent
+from config import Config, validate_config
+from core.agent import OutreachMode, get_agent, peek_agent, shared_imessage_tool, shared_mcp_client
+from exceptions import iMessageConnectionError
 from tools.mcp_client import MCPClient
 
-# Validate config on startup
-Config.validate()
+logger = logging.getLogger(__name__)
+
+# Validate config once on startup; fails the import if misconfigured. Under
+# gunicorn (preload_app) this runs in the master, once for all workers.
+validate_config()
+
+# Encode responses with orjson when it is installed
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+    encode_json = orjson.dumps
+except ImportError:
+    DefaultResponse = JSONResponse
+    _JSON_ENCODE = json.JSONEncoder(separators=(',', ':')).encode
+
+    def encode_json(value: Any) -> bytes:
+        """Serialize a value to compact JSON bytes"""
+        return _JSON_ENCODE(value).encode()
+
+
+async def probe_services(app: FastAPI, interval: float) -> None:
+    """
+    Keep app.state.service_health current by probing dependencies in the background.
+
+    /health serves the last result, so liveness probes never wait on (or
+    add load to) the MCP and iMessage servers.
+
+    Args:
+        app: Application whose state is updated
+        interval: Seconds between probes
+    """
+    mcp_client: MCPClient = app.state.mcp_client
+    try:
+        imessage_health = shared_imessage_tool().health_check
+    except iMessageConnectionError:
+        # No iMessage server configured; always report it as down
+        imessage_health = bool
+
+    while True:
+        try:
+            mcp_ok, imessage_ok = await asyncio.gather(
+                asyncio.to_thread(mcp_client.health_check),
+                asyncio.to_thread(imessage_health)
+            )
+        except Exception as e:
+            # A probe that raises must not end the task and freeze /health
+            logger.error(f"Service health probe failed: {e}")
+            mcp_ok = imessage_ok = False
+        app.state.service_health = {'mcp': mcp_ok, 'imessage': imessage_ok}
+        await asyncio.sleep(interval)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Set up process-wide resources on startup and release them on shutdown.
+
+    Routes and agents share one pooled MCP client. Blocking calls run on
+    worker threads, both from sync code in FastAPI (AnyIO's limiter) and
+    from the agent (asyncio.to_thread), so both pools are sized from
+    Config.WORKER_THREADS instead of their small defaults. Dependency
+    health is probed by a background task for the app's lifetime.
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = Config.WORKER_THREADS
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=Config.WORKER_THREADS)
+    )
+
+    app.state.mcp_client = shared_mcp_client()
+    app.state.service_health = {'mcp': False, 'imessage': False}
+    probe = asyncio.create_task(probe_services(app, Config.HEALTH_PROBE_INTERVAL))
+    try:
+        yield
+    finally:
+        probe.cancel()
+        with suppress(asyncio.CancelledError):
+            await probe
+        app.state.mcp_client.close()
+
 
 app = FastAPI(
     title="Socius Agent API",
     version="1.0.0",
-    description="AI networking agent for Socius"
+    description="AI networking agent for Socius",
+    lifespan=lifespan,
+    default_response_class=DefaultResponse
 )
 
+
+# Last rendered (unix second, ISO timestamp) for /health
+_health_timestamp = (0, '')
+
+
+def health_timestamp() -> str:
+    """
+    Current local time as an ISO string, at one-second resolution.
+
+    Liveness probes hit /health many times a second; the string is only
+    re-rendered when the second changes.
+    """
+    global _health_timestamp
+    second = int(time.time())
+    if _health_timestamp[0] != second:
+        _health_timestamp = (second, datetime.fromtimestamp(second).isoformat())
+    return _health_timestamp[1]
+
+
+def get_mcp_client(request: Request) -> MCPClient:
+    """Dependency returning the shared MCP client"""
+    return request.app.state.mcp_client
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -31,15 +142,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Store active agents (in production, use proper state management)
-active_agents: Dict[str, SociusAgent] = {}
-
-
 # Pydantic models
 class UserDetectedRequest(BaseModel):
     user_id: str
     other_user_id: str
     context: Dict
+    outreach_mode: OutreachMode = 'realtime'
 
 
 class IncomingMessageRequest(BaseModel):
@@ -60,42 +168,46 @@ class TaskRequest(BaseModel):
     task: str
 
 
+class UserProfileUpdate(BaseModel):
+    """Partial profile update; fields mirror socius_types.UserProfile"""
+    # Other profile fields stored in Sanity are passed through unchanged
+    model_config = ConfigDict(extra='allow')
+
+    name: Optional[str] = None
+    email: Optional[str] = None
+    role: Optional[str] = None
+    industry: Optional[str] = None
+    seniority: Optional[str] = None
+    interests: Optional[List[str]] = None
+    goals: Optional[List[str]] = None
+    contact: Optional[Dict[str, Optional[str]]] = None
+
+
+class UserPreferencesUpdate(BaseModel):
+    """Partial preferences update; fields mirror socius_types.UserPreferences"""
+    # Other preference keys are passed through unchanged, as with the free-form body before
+    model_config = ConfigDict(extra='allow')
+
+    conversation_style: Optional[Dict[str, Any]] = None
+    permissions: Optional[Dict[str, str]] = None
+    high_match_threshold: Optional[float] = None
+    auto_schedule_enabled: Optional[bool] = None
+
+
 class HealthResponse(BaseModel):
     status: str
     timestamp: str
     services: Dict[str, bool]
 
 
-def get_or_create_agent(user_id: str) -> SociusAgent:
-    """Get existing agent or create new one for user"""
-    if user_id not in active_agents:
-        active_agents[user_id] = SociusAgent(user_id)
-    return active_agents[user_id]
-
-
 @app.get('/health', response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint"""
-    mcp_client = MCPClient()
-
-    # Check service health
-    services = {
-        'agent': True,
-        'mcp': False,  # Will implement actual check
-        'imessage': False,
-    }
-
-    # Try to check iMessage server
-    try:
-        from tools.imessage_tool import iMessageTool
-        imsg = iMessageTool()
-        services['imessage'] = imsg.health_check()
-    except Exception:
-        services['imessage'] = False
+async def health_check(request: Request):
+    """Health check endpoint, serving the latest background probe results"""
+    services = {'agent': True, **request.app.state.service_health}
 
     return HealthResponse(
         status='healthy' if services['agent'] else 'degraded',
-        timestamp=datetime.now().isoformat(),
+        timestamp=health_timestamp(),
         services=services
     )
 
@@ -109,12 +221,13 @@ async def user_detected(user_id: str, request: UserDetectedRequest, background_t
     comes into range at an event.
     """
     try:
-        agent = get_or_create_agent(user_id)
+        agent = get_agent(user_id)
 
         # Handle the detection
-        result = agent.handle_new_person_nearby(
+        result = await agent.handle_new_person_nearby(
             request.other_user_id,
-            request.context
+            request.context,
+            request.outreach_mode
         )
 
         return result
@@ -131,9 +244,9 @@ async def incoming_message(user_id: str, request: IncomingMessageRequest):
     This is called when someone responds to the agent
     """
     try:
-        agent = get_or_create_agent(user_id)
+        agent = get_agent(user_id)
 
-        result = agent.handle_incoming_message(
+        result = await agent.handle_incoming_message(
             request.sender_id,
             request.message,
             request.conversation_id
@@ -148,14 +261,15 @@ async def incoming_message(user_id: str, request: IncomingMessageRequest):
 
 
 @app.post('/users/{user_id}/messages/send')
-async def send_message(user_id: str, request: SendMessageRequest):
+def send_message(user_id: str, request: SendMessageRequest):
     """
     Send a message on behalf of a user
 
-    This is called when the user manually wants to send a message through the agent
+    This is called when the user manually wants to send a message through the agent.
+    Declared sync because every call in it blocks; FastAPI runs it on a worker thread.
     """
     try:
-        agent = get_or_create_agent(user_id)
+        agent = get_agent(user_id)
 
         # Get recipient profile to determine contact method
         recipient_profile = agent.mcp_client.get_user_profile(request.recipient_id)
@@ -204,8 +318,8 @@ async def execute_task(user_id: str, request: TaskRequest):
     This allows the agent to be used for arbitrary tasks
     """
     try:
-        agent = get_or_create_agent(user_id)
-        result = agent.run(request.task)
+        agent = get_agent(user_id)
+        result = await agent.arun(request.task)
         return result
 
     except Exception as e:
@@ -213,9 +327,8 @@ async def execute_task(user_id: str, request: TaskRequest):
 
 
 @app.get('/users/{user_id}/profile')
-async def get_user_profile(user_id: str):
+def get_user_profile(user_id: str, mcp_client: MCPClient = Depends(get_mcp_client)):
     """Get user's profile"""
-    mcp_client = MCPClient()
     profile = mcp_client.get_user_profile(user_id)
 
     if not profile:
@@ -225,48 +338,90 @@ async def get_user_profile(user_id: str):
 
 
 @app.patch('/users/{user_id}/profile')
-async def update_user_profile(user_id: str, data: Dict):
+def update_user_profile(
+    user_id: str,
+    data: UserProfileUpdate,
+    mcp_client: MCPClient = Depends(get_mcp_client)
+):
     """Update user's profile"""
-    mcp_client = MCPClient()
-    success = mcp_client.update_user_profile(user_id, data)
+    success = mcp_client.update_user_profile(user_id, data.model_dump(exclude_unset=True))
 
     if not success:
         raise HTTPException(status_code=500, detail="Failed to update profile")
 
+    # A cached agent's system prompt is rendered from the profile
+    agent = peek_agent(user_id)
+    if agent is not None:
+        agent.refresh_profile()
+
     return {"success": True}
 
 
 @app.get('/users/{user_id}/preferences')
-async def get_user_preferences(user_id: str):
+def get_user_preferences(user_id: str, mcp_client: MCPClient = Depends(get_mcp_client)):
     """Get user's preferences"""
-    mcp_client = MCPClient()
     preferences = mcp_client.get_user_preferences(user_id)
     return preferences
 
 
 @app.patch('/users/{user_id}/preferences')
-async def update_user_preferences(user_id: str, preferences: Dict):
+def update_user_preferences(
+    user_id: str,
+    preferences: UserPreferencesUpdate,
+    mcp_client: MCPClient = Depends(get_mcp_client)
+):
     """Update user's preferences"""
-    mcp_client = MCPClient()
-    success = mcp_client.update_user_preferences(user_id, preferences)
+    success = mcp_client.update_user_preferences(user_id, preferences.model_dump(exclude_unset=True))
 
     if not success:
         raise HTTPException(status_code=500, detail="Failed to update preferences")
 
+    # A cached agent's system prompt is rendered from the preferences
+    agent = peek_agent(user_id)
+    if agent is not None:
+        agent.refresh_profile()
+
     return {"success": True}
 
 
 @app.get('/users/{user_id}/conversations/{conversation_id}')
-async def get_conversation(user_id: str, conversation_id: str, limit: int = 50):
-    """Get conversation history"""
-    mcp_client = MCPClient()
+def get_conversation(
+    user_id: str,
+    conversation_id: str,
+    limit: int = 50,
+    mcp_client: MCPClient = Depends(get_mcp_client)
+):
+    """
+    Get conversation history
+
+    The body is streamed one message at a time, so a large history is never
+    held as a single encoded document.
+    """
     messages = mcp_client.get_conversation_history(conversation_id, limit)
+    return StreamingResponse(
+        stream_conversation(conversation_id, messages),
+        media_type='application/json'
+    )
 
-    return {
-        'conversation_id': conversation_id,
-        'messages': messages,
-        'count': len(messages)
-    }
+
+def stream_conversation(conversation_id: str, messages: List[Dict]) -> Iterator[bytes]:
+    """
+    Encode a conversation response incrementally.
+
+    Yields the same document a plain JSON response would contain:
+    {"conversation_id": ..., "messages": [...], "count": n}.
+
+    Args:
+        conversation_id: Conversation ID
+        messages: Messages in the order they are returned
+
+    Yields:
+        Consecutive chunks of the JSON body
+    """
+    yield b'{"conversation_id":' + encode_json(conversation_id) + b',"messages":['
+    for i, message in enumerate(messages):
+        yield (b',' if i else b'') + encode_json(message)
+    yield b'],"count":' + str(len(messages)).encode() + b'}'
 
 
 if __name__ == '__main__':
@@ -276,9 +431,11 @@ if __name__ == '__main__':
     print(f"🔗 MCP Server: {Config.MCP_SERVER_URL}")
     print("")
 
+    # Development entry point; production runs under gunicorn.conf.py
     uvicorn.run(
         app,
         host='0.0.0.0',
         port=5000,
-        log_level='info'
+        log_level='info',
+        access_log=Config.ACCESS_LOG
     )
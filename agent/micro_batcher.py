@@ -0,0 +1,110 @@
+"""
+Coalesces concurrent single-key lookups into batched calls.
+"""
+import asyncio
+from typing import Callable, Dict, Generic, Hashable, List, Optional, Set, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class MicroBatcher(Generic[K, V]):
+    """
+    Collects keys requested by concurrent coroutines and fetches them together.
+
+    The first ``load`` in a window starts a short timer; every key requested
+    before it fires (or until ``max_batch_size`` distinct keys are waiting)
+    is passed to one call of the blocking ``fetch_many`` on a worker thread,
+    and each caller gets its own value back. A batcher belongs to the event
+    loop it is first used on.
+    """
+
+    def __init__(
+        self,
+        fetch_many: Callable[[List[K]], Dict[K, V]],
+        max_batch_size: int = 32,
+        max_delay: float = 0.01
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            fetch_many: Blocking function returning values for a list of keys;
+                keys missing from its result load as None
+            max_batch_size: Distinct keys that trigger an immediate fetch
+            max_delay: Seconds to wait for more keys before fetching
+
+        Raises:
+            ValueError: If max_batch_size or max_delay is not positive
+        """
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        if max_delay <= 0:
+            raise ValueError("max_delay must be positive")
+
+        self.fetch_many = fetch_many
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: Dict[K, List["asyncio.Future[Optional[V]]"]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Fetches in flight; the event loop only keeps weak references to tasks
+        self._fetches: Set["asyncio.Task[None]"] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        """
+        Get the value for a key, batched with other concurrent loads.
+
+        Args:
+            key: Key to look up
+
+        Returns:
+            The value, or None if fetch_many returned nothing for the key
+
+        Raises:
+            Exception: Whatever fetch_many raised for the batch
+        """
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Optional[V]]" = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Start fetching every pending key"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._fetch(batch))
+            self._fetches.add(task)
+            task.add_done_callback(self._fetches.discard)
+
+    async def _fetch(self, batch: Dict[K, List["asyncio.Future[Optional[V]]"]]) -> None:
+        """Fetch one batch and resolve its waiters"""
+        try:
+            values = await asyncio.to_thread(self.fetch_many, list(batch))
+        except asyncio.CancelledError:
+            # E.g. loop shutdown; waiters must not hang on a fetch that will never finish
+            for futures in batch.values():
+                for future in futures:
+                    future.cancel()
+            raise
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, futures in batch.items():
+            value = values.get(key)
+            for future in futures:
+                if not future.done():
+                    future.set_result(value)
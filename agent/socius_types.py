@@ -54,6 +54,12 @@ class UserPreferences(TypedDict):
     auto_schedule_enabled: bool
 
 
+class UserBundle(TypedDict, total=False):
+    """Profile and preferences fetched together in one MCP request"""
+    profile: Optional[UserProfile]
+    preferences: UserPreferences
+
+
 # Message and Conversation Types
 
 class MessageMetadata(TypedDict, total=False):
@@ -143,7 +149,7 @@ class ScheduleMeetingResult(TypedDict):
 
 class DetectionResponse(TypedDict):
     """Response when a user is detected nearby"""
-    action: str  # "sent_imessage", "sent_email", "request_permission", "skip", "no_contact_method"
+    action: str  # "sent_imessage", "sent_email", "queued_batch", "request_permission", "skip", "no_contact_method"
     recipient: Optional[str]
     message: Optional[str]
     success: Optional[bool]
@@ -151,6 +157,8 @@ class DetectionResponse(TypedDict):
     match_score: Optional[float]
     other_user: Optional[UserProfile]
     context: Optional[DetectionContext]
+    batch_id: Optional[str]  # Message batch holding the queued draft
+    custom_id: Optional[str]  # ID of the draft within the batch
 
 
 class IncomingMessageResponse(TypedDict):
@@ -198,41 +206,7 @@ class InteractionLog(TypedDict):
     metadata: Dict[str, any]
 
 
-# API Request/Response Types
-
-class UserDetectedRequest(TypedDict):
-    """Request body for user detected endpoint"""
-    user_id: str
-    other_user_id: str
-    context: DetectionContext
-
-
-class IncomingMessageRequest(TypedDict):
-    """Request body for incoming message endpoint"""
-    user_id: str
-    sender_id: str
-    message: str
-    conversation_id: str
-
-
-class SendMessageRequest(TypedDict):
-    """Request body for send message endpoint"""
-    user_id: str
-    recipient_id: str
-    message: str
-
-
-class TaskRequest(TypedDict):
-    """Request body for task execution endpoint"""
-    user_id: str
-    task: str
-
-
-class HealthResponse(TypedDict):
-    """Health check response"""
-    status: str
-    timestamp: str
-    services: Dict[str, bool]
+# API request and response bodies are the Pydantic models in main.py
 
 
 # iMessage Server Types
@@ -279,6 +253,18 @@ class EmailSendResponse(TypedDict):
     error: Optional[str]
 
 
+class EmailMessage(TypedDict):
+    """Gmail message fetched for the agent"""
+    message_id: str
+    thread_id: str
+    sender: str
+    to: str
+    subject: str
+    date: str
+    snippet: str
+    body: str
+
+
 class CalendarEventRequest(TypedDict):
     """Request to create calendar event"""
     summary: str
@@ -298,6 +284,18 @@ class CalendarEventResponse(TypedDict):
     error: Optional[str]
 
 
+class CalendarEvent(TypedDict):
+    """Calendar event fetched for the agent"""
+    event_id: str
+    summary: str
+    start: str  # ISO format
+    end: str  # ISO format
+    attendees: List[str]
+    location: Optional[str]
+    description: Optional[str]
+    event_link: Optional[str]
+
+
 class BusyTimeSlot(TypedDict):
     """Busy time slot from calendar"""
     start: str  # ISO format
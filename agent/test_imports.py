@@ -2,12 +2,155 @@
 Test that all imports work correctly and types are properly defined.
 This is a critical test to verify production readiness.
 """
+import ast
+import importlib
+import importlib.util
+import inspect
+import os
+import re
 import sys
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# Unfinished-code comment markers, compiled once for the scan. Matched against
+# whole files as raw bytes, so whitespace classes must not cross lines. Lone
+# pass statements are found by parsing instead (see find_lone_passes).
+PLACEHOLDER_RE = re.compile(
+    rb'#[ \t]*(TODO|FIXME|XXX|HACK|placeholder|stub|to be implemented|Future enhancement)',
+    re.IGNORECASE
+)
+
+# Names each module must export
+TYPE_NAMES = (
+    'UserProfile',
+    'UserPreferences',
+    'ConversationMessage',
+    'MatchResult',
+    'DetectionContext',
+    'DetectionResponse',
+    'IncomingMessageResponse',
+    'iMessageSendResponse',
+    'EmailSendResponse',
+    'CalendarEventResponse'
+)
+EXCEPTION_NAMES = (
+    'SociusError',
+    'MCPError',
+    'MCPConnectionError',
+    'MCPTimeoutError',
+    'iMessageError',
+    'iMessageConnectionError',
+    'iMessageSendError',
+    'GmailError',
+    'GmailAuthError',
+    'CalendarError'
+)
+
+
+def import_names(module_name, names):
+    """
+    Import a module and check that it defines the given names.
+
+    Args:
+        module_name: Module to import
+        names: Attributes the module must have
+
+    Raises:
+        ImportError: If the module can't be imported or lacks any of the names
+    """
+    module = importlib.import_module(module_name)
+    missing = [name for name in names if not hasattr(module, name)]
+    if missing:
+        raise ImportError(f"cannot import {', '.join(missing)} from '{module_name}'")
+
+
+def scan_comments(filepath):
+    """
+    Read one source file and find placeholder comment markers in it.
+
+    Safe to run on worker threads; parsing is left to find_lone_passes.
+
+    Args:
+        filepath: Path of the file to scan
+
+    Returns:
+        Tuple of (file bytes, [(line number, line text), ...]); the bytes are
+        None if the file is unreadable
+    """
+    # Read raw bytes: the patterns are ASCII, so only matched lines are decoded
+    try:
+        with open(filepath, 'rb') as f:
+            data = f.read()
+    except Exception as e:
+        logger.warning(f"Could not read {filepath}: {e}")
+        return None, []
+
+    # Scan the whole file at once; locate the line only for hits
+    found = []
+    if b'#' in data:
+        for match in PLACEHOLDER_RE.finditer(data):
+            start = data.rfind(b'\n', 0, match.start()) + 1
+            end = data.find(b'\n', match.start())
+            line = data[start:end if end != -1 else len(data)].decode('utf-8', 'replace')
+            found.append((data.count(b'\n', 0, start) + 1, line))
+    return data, found
+
+
+def find_lone_passes(filepath, data):
+    """
+    Find lines that hold nothing but a pass statement.
+
+    Uses the syntax tree, so "pass" inside a string or docstring is never
+    reported. Run on the main thread only: ast.parse is not thread-safe on
+    Python 3.11 and can fail with "AST constructor recursion depth mismatch".
+
+    Args:
+        filepath: Path of the file, for messages
+        data: The file's bytes
+
+    Returns:
+        [(line number, line text), ...] for each lone pass
+    """
+    if b'pass' not in data:
+        return []
+    try:
+        tree = ast.parse(data, filename=filepath)
+    except (SyntaxError, ValueError) as e:
+        logger.warning(f"Could not parse {filepath}: {e}")
+        return []
+
+    lines = data.splitlines()
+    found = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Pass):
+            line = lines[node.lineno - 1].decode('utf-8', 'replace')
+            if line.strip() == 'pass':
+                found.append((node.lineno, line))
+    return found
+
+
+def scan_for_placeholders(filepath, scanned=None):
+    """
+    Find placeholder matches in one source file.
+
+    Args:
+        filepath: Path of the file to scan
+        scanned: Result of scan_comments(filepath) if already computed
+
+    Returns:
+        "path:line: text" entries for each match, in line order (empty if unreadable)
+    """
+    data, found = scanned if scanned is not None else scan_comments(filepath)
+    if data is None:
+        return []
+    found = found + find_lone_passes(filepath, data)
+    return [f"{filepath}:{line_no}: {line.strip()}" for line_no, line in sorted(found)]
+
+
 def test_imports():
     """Test all module imports"""
     logger.info("Testing imports...")
@@ -15,34 +158,12 @@ def test_imports():
     try:
         # Test types module
         logger.info("  Importing socius_types...")
-        from socius_types import (
-            UserProfile,
-            UserPreferences,
-            ConversationMessage,
-            MatchResult,
-            DetectionContext,
-            DetectionResponse,
-            IncomingMessageResponse,
-            iMessageSendResponse,
-            EmailSendResponse,
-            CalendarEventResponse
-        )
+        import_names('socius_types', TYPE_NAMES)
         logger.info("    Types imported successfully")
 
         # Test exceptions module
         logger.info("  Importing exceptions...")
-        from exceptions import (
-            SociusError,
-            MCPError,
-            MCPConnectionError,
-            MCPTimeoutError,
-            iMessageError,
-            iMessageConnectionError,
-            iMessageSendError,
-            GmailError,
-            GmailAuthError,
-            CalendarError
-        )
+        import_names('exceptions', EXCEPTION_NAMES)
         logger.info("    Exceptions imported successfully")
 
         # Test config
@@ -70,20 +191,22 @@ def test_imports():
         from core.matching import MatchingEngine
         logger.info("    Matching engine imported successfully")
 
-        from core.permissions import PermissionsManager, ActionType, PermissionLevel
+        import_names('core.permissions', ('PermissionsManager', 'ActionType', 'PermissionLevel'))
         logger.info("    Permissions manager imported successfully")
 
-        # Test main module (but don't run it)
-        logger.info("  Importing main...")
-        try:
-            import main
+        # Test main module (but don't run it). Importing main validates config
+        # and builds the app, so by default only locate and compile it;
+        # set SOCIUS_FULL_IMPORT_TEST=1 to import it for real.
+        logger.info("  Checking main...")
+        spec = importlib.util.find_spec('main')
+        if spec is None:
+            raise ImportError("No module named 'main'")
+        if os.getenv('SOCIUS_FULL_IMPORT_TEST'):
+            importlib.import_module('main')
             logger.info("    Main module imported successfully")
-        except ImportError as e:
-            if 'anthropic' in str(e) or 'langchain' in str(e):
-                logger.warning(f"    Main module skipped (missing ML dependencies): {e}")
-                logger.warning("    Install with: pip install anthropic langchain langchain-anthropic")
-            else:
-                raise
+        else:
+            spec.loader.get_code('main')
+            logger.info("    Main module found and compiles")
 
         logger.info("\nAll imports successful!")
         return True
@@ -110,24 +233,18 @@ def test_type_hints():
         from tools.imessage_tool import iMessageTool
         from core.matching import MatchingEngine
 
-        # Check that methods have annotations
-        mcp = MCPClient.__init__
-        if not hasattr(mcp, '__annotations__'):
-            logger.warning("  MCPClient.__init__ missing annotations")
-        else:
-            logger.info("  MCPClient has type annotations")
-
-        imsg = iMessageTool.send_message
-        if not hasattr(imsg, '__annotations__'):
-            logger.warning("  iMessageTool.send_message missing annotations")
-        else:
-            logger.info("  iMessageTool.send_message has type annotations")
-
-        match = MatchingEngine.calculate_match_score
-        if not hasattr(match, '__annotations__'):
-            logger.warning("  MatchingEngine.calculate_match_score missing annotations")
-        else:
-            logger.info("  MatchingEngine.calculate_match_score has type annotations")
+        # Check that methods have annotations. Every function has an
+        # __annotations__ dict, so check that it is non-empty.
+        checks = (
+            (MCPClient.__init__, 'MCPClient.__init__'),
+            (iMessageTool.send_message, 'iMessageTool.send_message'),
+            (MatchingEngine.calculate_match_score, 'MatchingEngine.calculate_match_score'),
+        )
+        for fn, name in checks:
+            if inspect.get_annotations(fn):
+                logger.info(f"  {name} has type annotations")
+            else:
+                logger.warning(f"  {name} missing annotations")
 
         logger.info("Type hints check complete")
         return True
@@ -141,36 +258,25 @@ def test_no_placeholders():
     """Scan for placeholder comments in code"""
     logger.info("\nScanning for placeholder code...")
 
-    import os
-    import re
-
-    placeholder_patterns = [
-        r'#\s*(TODO|FIXME|XXX|HACK|placeholder|stub|to be implemented)',
-        r'^\s*pass\s*$',  # Lone pass statements
-        r'#\s*Future enhancement',
-    ]
-
-    violations = []
+    filepaths = []
     agent_dir = os.path.dirname(__file__)
 
     for root, dirs, files in os.walk(agent_dir):
-        # Skip __pycache__ and test files
-        if '__pycache__' in root or 'test_' in root:
-            continue
-
-        for file in files:
-            if not file.endswith('.py'):
-                continue
-
-            filepath = os.path.join(root, file)
-            try:
-                with open(filepath, 'r') as f:
-                    for line_no, line in enumerate(f, 1):
-                        for pattern in placeholder_patterns:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                violations.append(f"{filepath}:{line_no}: {line.strip()}")
-            except Exception as e:
-                logger.warning(f"Could not read {filepath}: {e}")
+        # Don't descend into caches, hidden dirs, virtualenvs or test dirs
+        dirs[:] = [
+            d for d in dirs
+            if not d.startswith(('__pycache__', '.', 'venv')) and 'test_' not in d
+        ]
+
+        filepaths.extend(os.path.join(root, file) for file in files if file.endswith('.py'))
+
+    # File reads release the GIL, so files are read and scanned for comments
+    # concurrently; parsing for lone passes then runs here on the main thread
+    with ThreadPoolExecutor(max_workers=min(32, len(filepaths) or 1)) as executor:
+        scanned = list(executor.map(scan_comments, filepaths))
+    violations = list(chain.from_iterable(
+        scan_for_placeholders(path, scan) for path, scan in zip(filepaths, scanned)
+    ))
 
     if violations:
         logger.error(f"Found {len(violations)} placeholder violations:")
@@ -2,6 +2,7 @@
 Integration test for Claude tool calling and system prompt.
 This tests the actual agent with Claude API.
 """
+import asyncio
 import os
 import sys
 import logging
@@ -17,38 +18,15 @@ def test_agent_tool_calling():
     logger.info("="*60)
 
     try:
-        # Mock the Google modules
-        from unittest.mock import MagicMock
-        sys.modules['google.auth.transport.requests'] = MagicMock()
-        sys.modules['google.oauth2.credentials'] = MagicMock()
-        sys.modules['google_auth_oauthlib.flow'] = MagicMock()
-        sys.modules['googleapiclient.discovery'] = MagicMock()
-        sys.modules['googleapiclient.errors'] = MagicMock()
-
-        # Import test dependencies
-        from test_agent_tools import MockMCPClient, MockiMessageTool, MockGmailTool
-        import tools.mcp_client
-        import tools.imessage_tool
-        import tools.gmail_tool
-
-        # Replace with mocks
-        original_mcp = tools.mcp_client.MCPClient
-        original_imessage = tools.imessage_tool.iMessageTool
-        original_gmail = tools.gmail_tool.GmailTool
-
-        tools.mcp_client.MCPClient = MockMCPClient
-        tools.imessage_tool.iMessageTool = MockiMessageTool
-        tools.gmail_tool.GmailTool = MockGmailTool
-
-        # Import agent
-        from core.agent import SociusAgent
+        # Agent wired to the mock tools, shared with the other test files
+        from test_agent_tools import shared_mock_agent
 
         logger.info("\n1. Testing agent initialization...")
-        agent = SociusAgent(user_id='test_user')
+        agent = shared_mock_agent()
         logger.info(f"   ✓ Agent initialized for user: {agent.user_profile.get('name')}")
 
         logger.info("\n2. Testing system prompt generation...")
-        prompt = agent._get_system_prompt()
+        prompt = agent.system_prompt
         logger.info(f"   ✓ System prompt generated ({len(prompt)} characters)")
         logger.info(f"   ✓ Includes user name: {'Test User' in prompt}")
         logger.info(f"   ✓ Includes interests: {'AI' in prompt}")
@@ -62,10 +40,10 @@ def test_agent_tool_calling():
         logger.info(f"   ✓ Agent response: {result['output'][:100]}...")
 
         logger.info("\n5. Testing autonomous outreach scenario...")
-        response = agent.handle_new_person_nearby(
+        response = asyncio.run(agent.handle_new_person_nearby(
             other_user_id='other_user',
             context={'event_name': 'Tech Conference 2025', 'location': 'San Francisco'}
-        )
+        ))
         logger.info(f"   ✓ Action taken: {response.get('action')}")
         if 'reason' in response:
             logger.info(f"   ✓ Reason: {response['reason']}")
@@ -81,11 +59,6 @@ def test_agent_tool_calling():
         for tool in agent.tools:
             logger.info(f"   ✓ Tool: {tool['name']}")
 
-        # Restore original classes
-        tools.mcp_client.MCPClient = original_mcp
-        tools.imessage_tool.iMessageTool = original_imessage
-        tools.gmail_tool.GmailTool = original_gmail
-
         logger.info("\n" + "="*60)
         logger.info("ALL INTEGRATION TESTS PASSED")
         logger.info("="*60)
@@ -5,8 +5,8 @@ Gmail Tool for sending emails, managing labels, and handling calendar events.
 import os
 import pickle
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, List
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, List, Tuple
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -17,8 +17,8 @@ from email.mime.text import MIMEText
 import base64
 
 from config import Config
-from socius_types import EmailSendResponse, CalendarEventResponse, BusyTimeSlot
-from exceptions import GmailAuthError, GmailSendError, CalendarAuthError, CalendarEventError
+from socius_types import EmailSendResponse, EmailMessage, CalendarEvent, CalendarEventResponse, BusyTimeSlot
+from exceptions import GmailError, GmailAuthError, GmailSendError, CalendarError, CalendarAuthError, CalendarEventError
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +31,9 @@ SCOPES = [
 
 EMAIL_PREVIEW_LENGTH = 200
 
+# Google caps batch requests at 100 calls; Gmail throttles large batches, so stay well below
+GOOGLE_BATCH_SIZE = 50
+
 
 class GmailTool:
     """Tool for Gmail email and calendar operations"""
@@ -71,8 +74,94 @@ class GmailTool:
             logger.error(f"Authentication failed: {e}")
             raise GmailAuthError(f"Failed to authenticate with Gmail/Calendar: {e}") from e
 
+    def _batch_get(
+        self,
+        service: Any,
+        ids: List[str],
+        build_request: Callable[[str], Any],
+        parse: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch several resources with Google batch HTTP requests.
+
+        One HTTP round trip per GOOGLE_BATCH_SIZE IDs instead of one per ID.
+        Failed lookups are logged and left out of the result.
+
+        Args:
+            service: Google API service whose batch endpoint is used
+            ids: Resource IDs to fetch (duplicates are fetched once)
+            build_request: Builds the get request for one ID
+            parse: Converts one API response into the returned shape
+
+        Returns:
+            Parsed resources keyed by ID
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def on_response(request_id: str, response: Dict[str, Any], exception: Optional[Exception]) -> None:
+            if exception is not None:
+                logger.warning(f"Batch lookup failed for {request_id}: {exception}")
+                return
+            results[request_id] = parse(response)
+
+        unique_ids = list(dict.fromkeys(ids))
+        for start in range(0, len(unique_ids), GOOGLE_BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=on_response)
+            for resource_id in unique_ids[start:start + GOOGLE_BATCH_SIZE]:
+                batch.add(build_request(resource_id), request_id=resource_id)
+            batch.execute()
+
+        return results
+
     # ------------------- Gmail Methods -------------------
 
+    def get_emails(self, message_ids: List[str]) -> Dict[str, EmailMessage]:
+        """
+        Fetch Gmail messages in batched requests.
+
+        Args:
+            message_ids: Gmail message IDs
+
+        Returns:
+            Messages keyed by ID; IDs that could not be fetched are omitted
+
+        Raises:
+            GmailError: If the batch request itself fails
+        """
+        messages = self.gmail_service.users().messages()
+        try:
+            return self._batch_get(
+                self.gmail_service,
+                message_ids,
+                lambda message_id: messages.get(userId="me", id=message_id, format="full"),
+                self._parse_email
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch emails: {e}")
+            raise GmailError(f"Failed to fetch emails: {e}") from e
+
+    @staticmethod
+    def _parse_email(message: Dict[str, Any]) -> EmailMessage:
+        """Convert a Gmail API message into an EmailMessage."""
+        payload = message.get("payload", {})
+        headers = {header["name"].lower(): header["value"] for header in payload.get("headers", [])}
+
+        def text_of(part: Dict[str, Any]) -> str:
+            if part.get("mimeType") == "text/plain" and "data" in part.get("body", {}):
+                return base64.urlsafe_b64decode(part["body"]["data"]).decode(errors="replace")
+            return "".join(text_of(child) for child in part.get("parts", []))
+
+        return {
+            "message_id": message["id"],
+            "thread_id": message.get("threadId", ""),
+            "sender": headers.get("from", ""),
+            "to": headers.get("to", ""),
+            "subject": headers.get("subject", ""),
+            "date": headers.get("date", ""),
+            "snippet": message.get("snippet", ""),
+            "body": text_of(payload),
+        }
+
     def send_email(self, to: str, subject: str, body: str, html: bool = False) -> EmailSendResponse:
         """Send an email via Gmail."""
         try:
@@ -129,6 +218,52 @@ class GmailTool:
             logger.error(f"Failed to create calendar event: {e}")
             raise CalendarEventError(f"Failed to create calendar event: {e}") from e
 
+    def get_calendar_events(self, event_ids: List[str], calendar_id: str = "primary") -> Dict[str, CalendarEvent]:
+        """
+        Fetch calendar events in batched requests.
+
+        Args:
+            event_ids: Calendar event IDs
+            calendar_id: Calendar the events belong to
+
+        Returns:
+            Events keyed by ID; IDs that could not be fetched are omitted
+
+        Raises:
+            CalendarError: If the batch request itself fails
+        """
+        events = self.calendar_service.events()
+        try:
+            return self._batch_get(
+                self.calendar_service,
+                event_ids,
+                lambda event_id: events.get(calendarId=calendar_id, eventId=event_id),
+                self._parse_calendar_event
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch calendar events: {e}")
+            raise CalendarError(f"Failed to fetch calendar events: {e}") from e
+
+    def get_calendar_event(self, event_id: str, calendar_id: str = "primary") -> Optional[CalendarEvent]:
+        """Fetch a single calendar event, or None if it could not be fetched."""
+        return self.get_calendar_events([event_id], calendar_id).get(event_id)
+
+    @staticmethod
+    def _parse_calendar_event(event: Dict[str, Any]) -> CalendarEvent:
+        """Convert a Calendar API event into a CalendarEvent."""
+        start = event.get("start", {})
+        end = event.get("end", {})
+        return {
+            "event_id": event["id"],
+            "summary": event.get("summary", ""),
+            "start": start.get("dateTime") or start.get("date", ""),
+            "end": end.get("dateTime") or end.get("date", ""),
+            "attendees": [attendee["email"] for attendee in event.get("attendees", []) if "email" in attendee],
+            "location": event.get("location"),
+            "description": event.get("description"),
+            "event_link": event.get("htmlLink"),
+        }
+
     def get_availability(self, start_date: datetime, end_date: datetime, calendar_id: str = "primary") -> List[BusyTimeSlot]:
         """Get busy times in the specified date range."""
         try:
@@ -149,18 +284,30 @@ class GmailTool:
         end_date = start_date + timedelta(days=days_ahead)
         busy_times = self.get_availability(start_date, end_date, calendar_id=calendar_id)
 
-        current_time = start_date
-        for busy_slot in busy_times:
-            try:
-                slot_start = datetime.fromisoformat(busy_slot["start"].replace("Z", "+00:00"))
-                if (slot_start - current_time).total_seconds() >= duration_minutes * 60:
-                    return current_time
-                current_time = datetime.fromisoformat(busy_slot["end"].replace("Z", "+00:00"))
-            except (KeyError, ValueError) as e:
-                logger.warning(f"Invalid busy slot format: {e}")
-                continue
+        # Busy times come back in UTC with an offset, so compare in aware UTC
+        duration = timedelta(minutes=duration_minutes)
+        current_time = start_date.replace(tzinfo=timezone.utc)
+        for slot_start, slot_end in self._parse_busy_slots(busy_times):
+            if slot_start - current_time >= duration:
+                return current_time
+            current_time = max(current_time, slot_end)
 
-        if (end_date - current_time).total_seconds() >= duration_minutes * 60:
+        if end_date.replace(tzinfo=timezone.utc) - current_time >= duration:
             return current_time
 
         return None
+
+    @staticmethod
+    def _parse_busy_slots(busy_times: List[BusyTimeSlot]) -> List[Tuple[datetime, datetime]]:
+        """Parse busy slots into (start, end) datetimes sorted by start, skipping malformed ones."""
+        slots = []
+        for busy_slot in busy_times:
+            try:
+                slots.append((
+                    datetime.fromisoformat(busy_slot["start"].replace("Z", "+00:00")),
+                    datetime.fromisoformat(busy_slot["end"].replace("Z", "+00:00"))
+                ))
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Invalid busy slot format: {e}")
+        slots.sort()
+        return slots
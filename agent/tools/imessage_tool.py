@@ -2,6 +2,7 @@
 iMessage Tool for sending messages via the bridge server.
 """
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional, List, Dict, Any
 import logging
 
@@ -15,13 +16,14 @@ logger = logging.getLogger(__name__)
 class iMessageTool:
     """Tool for sending iMessages via the macOS bridge server"""
 
-    def __init__(self, server_url: Optional[str] = None, timeout: int = 10):
+    def __init__(self, server_url: Optional[str] = None, timeout: int = 10, pool_maxsize: int = 32):
         """
         Initialize iMessage tool.
 
         Args:
             server_url: iMessage server URL, defaults to config value
             timeout: Request timeout in seconds
+            pool_maxsize: Keep-alive connections kept open to the iMessage server
 
         Raises:
             iMessageConnectionError: If server URL not configured
@@ -32,6 +34,13 @@ class iMessageTool:
         if not self.server_url:
             raise iMessageConnectionError("iMessage server URL not configured")
 
+        # Keep-alive connection pool reused by every request from this tool,
+        # which is shared by all agents in the process
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
     def send_message(self, recipient: str, message: str) -> iMessageSendResponse:
         """
         Send an iMessage to a recipient.
@@ -48,7 +57,7 @@ class iMessageTool:
             iMessageSendError: Failed to send message
         """
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.server_url}/send",
                 json={"recipient": recipient, "message": message},
                 timeout=self.timeout
@@ -124,7 +133,7 @@ class iMessageTool:
             logger.warning(f"Message limit capped at 200")
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.server_url}/messages",
                 params={"limit": limit},
                 timeout=self.timeout
@@ -161,7 +170,7 @@ class iMessageTool:
             True if server is healthy and accessible, False otherwise
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.server_url}/health",
                 timeout=5
             )
@@ -3,13 +3,16 @@ MCP Client for interacting with the MCP server.
 Handles all communication with Sanity.io, Redis, and SQLite via MCP server.
 """
 import requests
-from typing import Optional, List, Any, Dict
+from requests.adapters import HTTPAdapter
+from typing import Optional, List, Any, Dict, Tuple
 import logging
 
 from config import Config
+from ttl_cache import TTLCache
 from socius_types import (
     UserProfile,
     UserPreferences,
+    UserBundle,
     ConversationMessage,
     MessageTemplate,
     InteractionLog,
@@ -24,6 +27,9 @@ from exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Most profiles the MCP server returns from one batch request
+PROFILE_BATCH_SIZE = 100
+
 
 class MCPClient:
     """
@@ -37,13 +43,26 @@ class MCPClient:
     - Interaction logs (SQLite)
     """
 
-    def __init__(self, server_url: Optional[str] = None, timeout: int = 10):
+    def __init__(
+        self,
+        server_url: Optional[str] = None,
+        timeout: int = 10,
+        profile_cache_ttl: float = 60.0,
+        template_cache_ttl: float = 3600.0,
+        pool_maxsize: int = 32
+    ):
         """
         Initialize MCP client.
 
         Args:
             server_url: MCP server URL, defaults to config value
             timeout: Request timeout in seconds
+            profile_cache_ttl: Seconds a fetched user profile or preferences
+                record is served from the in-process cache before it is
+                fetched again
+            template_cache_ttl: Seconds fetched message templates are served
+                from the in-process cache before they are fetched again
+            pool_maxsize: Keep-alive connections kept open to the MCP server
 
         Raises:
             ConfigurationError: If server URL not provided and not in config
@@ -54,6 +73,25 @@ class MCPClient:
         if not self.server_url:
             raise MCPConnectionError("MCP server URL not configured")
 
+        # Keep-alive connection pool reused by every request from this client.
+        # One client is shared by all agents in the process and its calls run
+        # on worker threads, so the pool is sized above requests' default of 10.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Profiles are read on almost every agent action but change rarely
+        self._profile_cache: TTLCache[UserProfile] = TTLCache(maxsize=4096, ttl=profile_cache_ttl)
+        self._preferences_cache: TTLCache[UserPreferences] = TTLCache(maxsize=4096, ttl=profile_cache_ttl)
+
+        # Templates are edited in Sanity a few times a day at most
+        self._template_cache: TTLCache[List[MessageTemplate]] = TTLCache(maxsize=32, ttl=template_cache_ttl)
+
+    def close(self) -> None:
+        """Close the pooled connections to the MCP server."""
+        self.session.close()
+
     def _make_request(
         self,
         method: str,
@@ -83,7 +121,7 @@ class MCPClient:
         url = f"{self.server_url}{endpoint}"
 
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
                 json=json_data,
@@ -127,6 +165,10 @@ class MCPClient:
         """
         Get user profile from Sanity.io via MCP.
 
+        Found profiles are cached for ``profile_cache_ttl`` seconds; missing
+        profiles are not cached so a newly created user is seen right away.
+        Concurrent misses for the same user share one request.
+
         Args:
             user_id: User ID to fetch
 
@@ -138,6 +180,10 @@ class MCPClient:
             MCPTimeoutError: If request times out
             MCPError: For other server errors
         """
+        return self._profile_cache.get_or_load(user_id, lambda: self._fetch_user_profile(user_id))
+
+    def _fetch_user_profile(self, user_id: str) -> Optional[UserProfile]:
+        """Fetch a user profile from the MCP server, bypassing the cache"""
         try:
             response = self._make_request('GET', f'/profiles/{user_id}')
             return response.json()
@@ -146,6 +192,63 @@ class MCPClient:
             logger.info(f"User profile not found: {user_id}")
             return None
 
+    def get_user_profiles(self, user_ids: List[str]) -> Dict[str, UserProfile]:
+        """
+        Get several user profiles, fetching uncached ones in batched requests.
+
+        Cached profiles are served locally; the rest are requested in chunks
+        of ``PROFILE_BATCH_SIZE`` per round trip. Against an MCP server
+        without the batch endpoint, falls back to one request per profile.
+
+        Args:
+            user_ids: User IDs to fetch
+
+        Returns:
+            Profiles keyed by user ID; users that don't exist are left out
+
+        Raises:
+            MCPConnectionError: If cannot connect to MCP server
+            MCPTimeoutError: If request times out
+            MCPError: For other server errors
+        """
+        profiles: Dict[str, UserProfile] = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            cached = self._profile_cache.get(user_id)
+            if cached is not None:
+                profiles[user_id] = cached
+            else:
+                missing.append(user_id)
+
+        for start in range(0, len(missing), PROFILE_BATCH_SIZE):
+            chunk = missing[start:start + PROFILE_BATCH_SIZE]
+            try:
+                response = self._make_request('POST', '/profiles/batch_get', json_data={'user_ids': chunk})
+                fetched = response.json().get('profiles', {})
+
+            except MCPNotFoundError:
+                logger.info("MCP server has no batch profile endpoint, fetching profiles separately")
+                fetched = {}
+                for user_id in chunk:
+                    profile = self.get_user_profile(user_id)
+                    if profile is not None:
+                        fetched[user_id] = profile
+
+            for user_id, profile in fetched.items():
+                self._profile_cache.set(user_id, profile)
+            profiles.update(fetched)
+
+        return profiles
+
+    def invalidate_user_profile(self, user_id: str) -> None:
+        """
+        Drop a cached user profile so the next lookup hits the MCP server.
+
+        Args:
+            user_id: User ID whose cached profile should be discarded
+        """
+        self._profile_cache.invalidate(user_id)
+
     def update_user_profile(self, user_id: str, data: Dict[str, Any]) -> bool:
         """
         Update user profile in Sanity.io via MCP.
@@ -165,6 +268,7 @@ class MCPClient:
             MCPError: For other server errors
         """
         response = self._make_request('PATCH', f'/profiles/{user_id}', json_data=data)
+        self.invalidate_user_profile(user_id)
         return response.status_code == 200
 
     def get_conversation_history(
@@ -241,6 +345,9 @@ class MCPClient:
         """
         Get user preferences from SQLite via MCP.
 
+        Preferences are cached for ``profile_cache_ttl`` seconds, and
+        concurrent misses for the same user share one request.
+
         Args:
             user_id: User ID
 
@@ -252,6 +359,10 @@ class MCPClient:
             MCPTimeoutError: If request times out
             MCPError: For other server errors
         """
+        return self._preferences_cache.get_or_load(user_id, lambda: self._fetch_user_preferences(user_id))
+
+    def _fetch_user_preferences(self, user_id: str) -> UserPreferences:
+        """Fetch user preferences from the MCP server, bypassing the cache"""
         try:
             response = self._make_request('GET', f'/preferences/{user_id}')
             return response.json()
@@ -278,6 +389,48 @@ class MCPClient:
                 'auto_schedule_enabled': True
             }
 
+    def get_user_bundle(
+        self,
+        user_id: str,
+        fields: Tuple[str, ...] = ('profile', 'preferences')
+    ) -> UserBundle:
+        """
+        Get a user's profile and/or preferences in a single MCP request.
+
+        A fetched profile also populates the profile cache. Against an MCP
+        server without the bundle endpoint, falls back to one request per field.
+
+        Args:
+            user_id: User ID
+            fields: Parts to fetch ("profile", "preferences")
+
+        Returns:
+            Dict with the requested parts; "profile" is None if the user doesn't exist
+
+        Raises:
+            MCPConnectionError: If cannot connect to MCP server
+            MCPTimeoutError: If request times out
+            MCPError: If fields contains an unknown part, or for other server errors
+        """
+        try:
+            response = self._make_request(
+                'GET',
+                f'/users/{user_id}/bundle',
+                params={'fields': ','.join(fields)}
+            )
+            bundle = response.json()
+
+        except MCPNotFoundError:
+            logger.info("MCP server has no bundle endpoint, fetching fields separately")
+            fetchers = {'profile': self.get_user_profile, 'preferences': self.get_user_preferences}
+            return {field: fetchers[field](user_id) for field in fields if field in fetchers}
+
+        if bundle.get('profile'):
+            self._profile_cache.set(user_id, bundle['profile'])
+        if bundle.get('preferences'):
+            self._preferences_cache.set(user_id, bundle['preferences'])
+        return bundle
+
     def update_user_preferences(self, user_id: str, preferences: Dict[str, Any]) -> bool:
         """
         Update user preferences in SQLite via MCP.
@@ -300,8 +453,18 @@ class MCPClient:
             f'/preferences/{user_id}',
             json_data=preferences
         )
+        self.invalidate_user_preferences(user_id)
         return response.status_code == 200
 
+    def invalidate_user_preferences(self, user_id: str) -> None:
+        """
+        Drop cached user preferences so the next lookup hits the MCP server.
+
+        Args:
+            user_id: User ID whose cached preferences should be discarded
+        """
+        self._preferences_cache.invalidate(user_id)
+
     def get_message_templates(self, template_type: str = 'introduction') -> List[MessageTemplate]:
         """
         Get message templates from Sanity.io via MCP.
@@ -317,6 +480,10 @@ class MCPClient:
             MCPTimeoutError: If request times out
             MCPError: For other server errors
         """
+        cached = self._template_cache.get(template_type)
+        if cached is not None:
+            return cached
+
         try:
             response = self._make_request(
                 'GET',
@@ -324,12 +491,16 @@ class MCPClient:
                 params={'type': template_type}
             )
             data = response.json()
-            return data.get('templates', [])
+            templates = data.get('templates', [])
 
         except MCPNotFoundError:
             logger.info(f"No templates found for type: {template_type}")
             return []
 
+        if templates:
+            self._template_cache.set(template_type, templates)
+        return templates
+
     def log_interaction(
         self,
         user_id: str,
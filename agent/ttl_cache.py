@@ -0,0 +1,173 @@
+"""
+In-process TTL cache for data fetched from external services.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar('V')
+
+
+class _Flight(Generic[V]):
+    """A load in progress that other callers for the same key wait on"""
+
+    __slots__ = ('done', 'value', 'error', 'stale')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Optional[V] = None
+        self.error: Optional[BaseException] = None
+        # Set when the key is invalidated or overwritten during the load; the
+        # loaded value may predate that change, so it is not cached
+        self.stale = False
+
+
+class TTLCache(Generic[V]):
+    """
+    Thread-safe, size-bounded cache whose entries expire after a fixed TTL.
+
+    Used in front of MCP lookups that are read far more often than they
+    change. When full, the least recently written entry is evicted.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept (must be positive)
+            ttl: Seconds an entry stays valid after it is written
+
+        Raises:
+            ValueError: If maxsize or ttl is not positive
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._inflight: Dict[Hashable, _Flight[V]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            return self._get_locked(key)
+
+    def _get_locked(self, key: Hashable) -> Optional[V]:
+        """Look up a live entry; the caller holds the lock"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        return value
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Optional[V]]) -> Optional[V]:
+        """
+        Get a cached value, loading and caching it on a miss.
+
+        Concurrent misses for the same key share one call to ``load``: the
+        first caller runs it and the others wait for its result. A None
+        result is returned to every waiter but not cached, and neither is a
+        result whose key was invalidated, set or cleared while it loaded.
+
+        Args:
+            key: Cache key
+            load: Fetches the value when it is not cached
+
+        Returns:
+            The cached or loaded value
+
+        Raises:
+            Exception: Whatever load raised, re-raised in every waiting caller
+        """
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not None:
+                return value
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = load()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.value is not None and not flight.stale:
+                    self._set_locked(key, flight.value)
+                del self._inflight[key]
+            flight.done.set()
+
+        return flight.value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """
+        Store a value, replacing any existing entry for the key.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._mark_stale_locked(key)
+            self._set_locked(key, value)
+
+    def _set_locked(self, key: Hashable, value: V) -> None:
+        """Store an entry and evict past maxsize; the caller holds the lock"""
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove a key from the cache if present.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._mark_stale_locked(key)
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            for flight in self._inflight.values():
+                flight.stale = True
+            self._entries.clear()
+
+    def _mark_stale_locked(self, key: Hashable) -> None:
+        """Keep a load in progress for key from caching its result; the caller holds the lock"""
+        flight = self._inflight.get(key)
+        if flight is not None:
+            flight.stale = True
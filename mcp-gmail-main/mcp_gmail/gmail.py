@@ -7,7 +7,7 @@ import json
 import os
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -33,6 +33,12 @@ GMAIL_MODIFY_SCOPE = ["https://www.googleapis.com/auth/gmail.modify"]
 # Type alias for the Gmail service
 GmailService = Resource
 
+# Calls per batch HTTP request; Gmail allows 100 but rate-limits batches larger than 50
+MAX_BATCH_SIZE = 50
+
+# Partial response for messages.list: callers only need the IDs, not resultSizeEstimate
+MESSAGE_LIST_FIELDS = "messages(id,threadId),nextPageToken"
+
 
 def get_gmail_service(
     credentials_path: str = DEFAULT_CREDENTIALS_PATH,
@@ -282,7 +288,10 @@ def list_messages(
         List of message objects
     """
     response = (
-        service.users().messages().list(userId=user_id, maxResults=max_results, q=query or "").execute()
+        service.users()
+        .messages()
+        .list(userId=user_id, maxResults=max_results, q=query or "", fields=MESSAGE_LIST_FIELDS)
+        .execute()
     )
     messages = response.get("messages", [])
     return messages
@@ -374,7 +383,12 @@ def search_messages(
     return list_messages(service, user_id, max_results, query)
 
 
-def get_message(service: GmailService, message_id: str, user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+def get_message(
+    service: GmailService,
+    message_id: str,
+    user_id: str = DEFAULT_USER_ID,
+    metadata_headers: Optional[List[str]] = None,
+) -> Dict[str, Any]:
     """
     Get a specific message by ID.
 
@@ -382,14 +396,81 @@ def get_message(service: GmailService, message_id: str, user_id: str = DEFAULT_U
         service: Gmail API service instance
         message_id: Gmail message ID
         user_id: Gmail user ID (default: 'me')
+        metadata_headers: If given, fetch only these headers (metadata format, no body)
 
     Returns:
         Message object
     """
-    message = service.users().messages().get(userId=user_id, id=message_id).execute()
+    message = _message_get_request(service, message_id, user_id, metadata_headers).execute()
     return message
 
 
+def _message_get_request(
+    service: GmailService, message_id: str, user_id: str, metadata_headers: Optional[List[str]]
+) -> Any:
+    """Build a messages.get request in full format, or metadata format if headers are given."""
+    if metadata_headers:
+        return (
+            service.users()
+            .messages()
+            .get(userId=user_id, id=message_id, format="metadata", metadataHeaders=metadata_headers)
+        )
+    return service.users().messages().get(userId=user_id, id=message_id)
+
+
+def get_messages_batch(
+    service: GmailService,
+    message_ids: List[str],
+    user_id: str = DEFAULT_USER_ID,
+    metadata_headers: Optional[List[str]] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Exception]]:
+    """
+    Get several messages by ID, using one batch HTTP request per MAX_BATCH_SIZE messages.
+
+    Args:
+        service: Gmail API service instance
+        message_ids: Gmail message IDs (duplicates are fetched once)
+        user_id: Gmail user ID (default: 'me')
+        metadata_headers: If given, fetch only these headers (metadata format, no body)
+
+    Returns:
+        Tuple of (message objects, errors), each keyed by message ID. If a batch request
+        fails as a whole, its messages are fetched individually instead.
+    """
+    messages: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, Exception] = {}
+
+    def on_response(request_id: str, response: Dict[str, Any], exception: Optional[Exception]) -> None:
+        if exception is not None:
+            errors[request_id] = exception
+        else:
+            messages[request_id] = response
+
+    unique_ids = list(dict.fromkeys(message_ids))
+    for start in range(0, len(unique_ids), MAX_BATCH_SIZE):
+        chunk = unique_ids[start : start + MAX_BATCH_SIZE]
+        batch = service.new_batch_http_request(callback=on_response)
+        for message_id in chunk:
+            batch.add(
+                _message_get_request(service, message_id, user_id, metadata_headers), request_id=message_id
+            )
+        try:
+            batch.execute()
+        except Exception:
+            # The batch endpoint itself failed; fetch what is still missing one by one
+            for message_id in chunk:
+                if message_id in messages or message_id in errors:
+                    continue
+                try:
+                    messages[message_id] = get_message(
+                        service, message_id, user_id=user_id, metadata_headers=metadata_headers
+                    )
+                except Exception as e:
+                    errors[message_id] = e
+
+    return messages, errors
+
+
 def get_thread(service: GmailService, thread_id: str, user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
     """
     Get a specific thread by ID.
@@ -587,6 +668,61 @@ def modify_message_labels(
     return service.users().messages().modify(userId=user_id, id=message_id, body=body).execute()
 
 
+def modify_message_labels_with_headers(
+    service: GmailService,
+    message_id: str,
+    add_labels: Optional[List[str]] = None,
+    remove_labels: Optional[List[str]] = None,
+    headers: Optional[List[str]] = None,
+    user_id: str = DEFAULT_USER_ID,
+) -> Dict[str, Any]:
+    """
+    Modify the labels on a message and read its headers in one batch HTTP request.
+
+    messages.modify only returns the message's ID and labels, so the headers come from a
+    metadata-format get sent in the same batch. The two calls may run in either order, so
+    use the result for headers, not labels.
+
+    Args:
+        service: Gmail API service instance
+        message_id: Message ID
+        add_labels: List of label IDs to add (optional)
+        remove_labels: List of label IDs to remove (optional)
+        headers: Header names to return (default: Subject)
+        user_id: Gmail user ID (default: 'me')
+
+    Returns:
+        Message object in metadata format (headers, no body)
+
+    Raises:
+        HttpError: If the modify or the get fails
+    """
+    responses: Dict[str, Tuple[Optional[Dict[str, Any]], Optional[Exception]]] = {}
+
+    def on_response(request_id: str, response: Dict[str, Any], exception: Optional[Exception]) -> None:
+        responses[request_id] = (response, exception)
+
+    body = {"addLabelIds": add_labels or [], "removeLabelIds": remove_labels or []}
+    batch = service.new_batch_http_request(callback=on_response)
+    batch.add(
+        service.users().messages().modify(userId=user_id, id=message_id, body=body),
+        request_id="modify",
+    )
+    batch.add(
+        service.users()
+        .messages()
+        .get(userId=user_id, id=message_id, format="metadata", metadataHeaders=headers or ["Subject"]),
+        request_id="get",
+    )
+    batch.execute()
+
+    for request_id in ("modify", "get"):
+        exception = responses[request_id][1]
+        if exception is not None:
+            raise exception
+    return responses["get"][0]
+
+
 def batch_modify_messages_labels(
     service: GmailService,
     message_ids: List[str],
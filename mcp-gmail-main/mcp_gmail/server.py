@@ -6,7 +6,9 @@ It exposes Gmail messages as resources and provides tools for composing and send
 """
 
 import re
+import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
@@ -18,9 +20,10 @@ from mcp_gmail.gmail import (
     get_headers_dict,
     get_labels,
     get_message,
+    get_messages_batch,
     get_thread,
     list_messages,
-    modify_message_labels,
+    modify_message_labels_with_headers,
     parse_message_body,
     search_messages,
 )
@@ -40,6 +43,13 @@ mcp = FastMCP(
 
 EMAIL_PREVIEW_LENGTH = 200
 
+# Headers shown by format_message_summary; search results fetch only these
+SUMMARY_HEADERS = ["From", "Subject", "Date"]
+
+# Labels rarely change; label tools reuse the list for this many seconds
+LABEL_CACHE_TTL = 300
+_labels_cache = None  # (monotonic fetch time, labels)
+
 
 
 # Helper functions
@@ -64,6 +74,45 @@ Date: {date}
 """
 
 
+@lru_cache(maxsize=1)
+def get_sender_address():
+    """Email address of the authenticated account, looked up once per process."""
+    return service.users().getProfile(userId=settings.user_id).execute().get("emailAddress")
+
+
+def get_labels_cached():
+    """The user's labels, refetched at most every LABEL_CACHE_TTL seconds."""
+    global _labels_cache
+    now = time.monotonic()
+    if _labels_cache is None or now - _labels_cache[0] >= LABEL_CACHE_TTL:
+        _labels_cache = (now, get_labels(service, user_id=settings.user_id))
+    return _labels_cache[1]
+
+
+def get_label_name(label_id):
+    """Display name of a label, or the ID itself if no label has that ID."""
+    for label in get_labels_cached():
+        if label.get("id") == label_id:
+            return label.get("name", label_id)
+    return label_id
+
+
+def format_message_summary(message_id, message):
+    """Format a message's ID, sender, subject and date for search results."""
+    headers = get_headers_dict(message)
+
+    from_header = headers.get("From", "Unknown")
+    subject = headers.get("Subject", "No Subject")
+    date = headers.get("Date", "Unknown Date")
+
+    return f"""
+Message ID: {message_id}
+From: {from_header}
+Subject: {subject}
+Date: {date}
+"""
+
+
 def validate_date_format(date_str):
     """
     Validate that a date string is in the format YYYY/MM/DD.
@@ -120,12 +169,12 @@ def get_email_thread(thread_id: str) -> str:
     thread = get_thread(service, thread_id, user_id=settings.user_id)
     messages = thread.get("messages", [])
 
-    result = f"Email Thread (ID: {thread_id})\n"
+    parts = [f"Email Thread (ID: {thread_id})\n"]
     for i, message in enumerate(messages, 1):
-        result += f"\n--- Message {i} ---\n"
-        result += format_message(message)
+        parts.append(f"\n--- Message {i} ---\n")
+        parts.append(format_message(message))
 
-    return result
+    return "".join(parts)
 
 
 # Tools
@@ -146,7 +195,7 @@ def compose_email(
     Returns:
         The ID of the created draft and its content
     """
-    sender = service.users().getProfile(userId=settings.user_id).execute().get("emailAddress")
+    sender = get_sender_address()
     draft = create_draft(
         service, sender=sender, to=to, subject=subject, body=body, user_id=settings.user_id, cc=cc, bcc=bcc
     )
@@ -179,7 +228,7 @@ def send_email(
     Returns:
         Content of the sent email
     """
-    sender = service.users().getProfile(userId=settings.user_id).execute().get("emailAddress")
+    sender = get_sender_address()
     message = gmail_send_email(
         service, sender=sender, to=to, subject=subject, body=body, user_id=settings.user_id, cc=cc, bcc=bcc
     )
@@ -246,23 +295,20 @@ def search_emails(
         max_results=max_results,
     )
 
-    result = f"Found {len(messages)} messages matching criteria:\n"
+    parts = [f"Found {len(messages)} messages matching criteria:\n"]
 
-    for msg_info in messages:
-        msg_id = msg_info.get("id")
-        message = get_message(service, msg_id, user_id=settings.user_id)
-        headers = get_headers_dict(message)
-
-        from_header = headers.get("From", "Unknown")
-        subject = headers.get("Subject", "No Subject")
-        date = headers.get("Date", "Unknown Date")
+    # One batched fetch for all matches instead of a request per message
+    msg_ids = [msg_info.get("id") for msg_info in messages]
+    fetched, errors = get_messages_batch(
+        service, msg_ids, user_id=settings.user_id, metadata_headers=SUMMARY_HEADERS
+    )
 
-        result += f"\nMessage ID: {msg_id}\n"
-        result += f"From: {from_header}\n"
-        result += f"Subject: {subject}\n"
-        result += f"Date: {date}\n"
+    for msg_id in msg_ids:
+        if msg_id not in fetched:
+            raise errors[msg_id]
+        parts.append(format_message_summary(msg_id, fetched[msg_id]))
 
-    return result
+    return "".join(parts)
 
 
 @mcp.tool()
@@ -279,23 +325,20 @@ def query_emails(query: str, max_results: int = 10) -> str:
     """
     messages = list_messages(service, user_id=settings.user_id, max_results=max_results, query=query)
 
-    result = f'Found {len(messages)} messages matching query: "{query}"\n'
+    parts = [f'Found {len(messages)} messages matching query: "{query}"\n']
 
-    for msg_info in messages:
-        msg_id = msg_info.get("id")
-        message = get_message(service, msg_id, user_id=settings.user_id)
-        headers = get_headers_dict(message)
-
-        from_header = headers.get("From", "Unknown")
-        subject = headers.get("Subject", "No Subject")
-        date = headers.get("Date", "Unknown Date")
+    # One batched fetch for all matches instead of a request per message
+    msg_ids = [msg_info.get("id") for msg_info in messages]
+    fetched, errors = get_messages_batch(
+        service, msg_ids, user_id=settings.user_id, metadata_headers=SUMMARY_HEADERS
+    )
 
-        result += f"\nMessage ID: {msg_id}\n"
-        result += f"From: {from_header}\n"
-        result += f"Subject: {subject}\n"
-        result += f"Date: {date}\n"
+    for msg_id in msg_ids:
+        if msg_id not in fetched:
+            raise errors[msg_id]
+        parts.append(format_message_summary(msg_id, fetched[msg_id]))
 
-    return result
+    return "".join(parts)
 
 
 @mcp.tool()
@@ -306,19 +349,17 @@ def list_available_labels() -> str:
     Returns:
         Formatted list of labels with their IDs
     """
-    labels = get_labels(service, user_id=settings.user_id)
+    labels = get_labels_cached()
 
-    result = "Available Gmail Labels:\n"
+    parts = ["Available Gmail Labels:\n"]
     for label in labels:
         label_id = label.get("id", "Unknown")
         name = label.get("name", "Unknown")
         type_info = label.get("type", "user")
 
-        result += f"\nLabel ID: {label_id}\n"
-        result += f"Name: {name}\n"
-        result += f"Type: {type_info}\n"
+        parts.append(f"\nLabel ID: {label_id}\nName: {name}\nType: {type_info}\n")
 
-    return result
+    return "".join(parts)
 
 
 @mcp.tool()
@@ -333,11 +374,11 @@ def mark_message_read(message_id: str) -> str:
         Confirmation message
     """
     # Remove the UNREAD label
-    result = modify_message_labels(
+    result = modify_message_labels_with_headers(
         service, user_id=settings.user_id, message_id=message_id, remove_labels=["UNREAD"], add_labels=[]
     )
 
-    # Get message details to show what was modified
+    # Subject of the modified message, fetched in the same batch
     headers = get_headers_dict(result)
     subject = headers.get("Subject", "No Subject")
 
@@ -361,21 +402,16 @@ def add_label_to_message(message_id: str, label_id: str) -> str:
         Confirmation message
     """
     # Add the specified label
-    result = modify_message_labels(
+    result = modify_message_labels_with_headers(
         service, user_id=settings.user_id, message_id=message_id, remove_labels=[], add_labels=[label_id]
     )
 
-    # Get message details to show what was modified
+    # Subject of the modified message, fetched in the same batch
     headers = get_headers_dict(result)
     subject = headers.get("Subject", "No Subject")
 
     # Get the label name for the confirmation message
-    label_name = label_id
-    labels = get_labels(service, user_id=settings.user_id)
-    for label in labels:
-        if label.get("id") == label_id:
-            label_name = label.get("name", label_id)
-            break
+    label_name = get_label_name(label_id)
 
     return f"""
 Label added to message:
@@ -398,19 +434,14 @@ def remove_label_from_message(message_id: str, label_id: str) -> str:
         Confirmation message
     """
     # Get the label name before we remove it
-    label_name = label_id
-    labels = get_labels(service, user_id=settings.user_id)
-    for label in labels:
-        if label.get("id") == label_id:
-            label_name = label.get("name", label_id)
-            break
+    label_name = get_label_name(label_id)
 
     # Remove the specified label
-    result = modify_message_labels(
+    result = modify_message_labels_with_headers(
         service, user_id=settings.user_id, message_id=message_id, remove_labels=[label_id], add_labels=[]
     )
 
-    # Get message details to show what was modified
+    # Subject of the modified message, fetched in the same batch
     headers = get_headers_dict(result)
     subject = headers.get("Subject", "No Subject")
 
@@ -436,33 +467,33 @@ def get_emails(message_ids: list[str]) -> str:
     if not message_ids:
         return "No message IDs provided."
 
-    # Fetch all emails first
+    # Fetch all emails first, in batches rather than one request per message
+    messages, errors = get_messages_batch(service, message_ids, user_id=settings.user_id)
+
     retrieved_emails = []
     error_emails = []
 
     for msg_id in message_ids:
-        try:
-            message = get_message(service, msg_id, user_id=settings.user_id)
-            retrieved_emails.append((msg_id, message))
-        except Exception as e:
-            error_emails.append((msg_id, str(e)))
+        if msg_id in messages:
+            retrieved_emails.append((msg_id, messages[msg_id]))
+        else:
+            error_emails.append((msg_id, str(errors[msg_id])))
 
     # Build result string after fetching all emails
-    result = f"Retrieved {len(retrieved_emails)} emails:\n"
+    parts = [f"Retrieved {len(retrieved_emails)} emails:\n"]
 
     # Format all successfully retrieved emails
     for i, (msg_id, message) in enumerate(retrieved_emails, 1):
-        result += f"\n--- Email {i} (ID: {msg_id}) ---\n"
-        result += format_message(message)
+        parts.append(f"\n--- Email {i} (ID: {msg_id}) ---\n")
+        parts.append(format_message(message))
 
     # Report any errors
     if error_emails:
-        result += f"\n\nFailed to retrieve {len(error_emails)} emails:\n"
+        parts.append(f"\n\nFailed to retrieve {len(error_emails)} emails:\n")
         for i, (msg_id, error) in enumerate(error_emails, 1):
-            result += f"\n--- Email {i} (ID: {msg_id}) ---\n"
-            result += f"Error: {error}\n"
+            parts.append(f"\n--- Email {i} (ID: {msg_id}) ---\nError: {error}\n")
 
-    return result
+    return "".join(parts)
 
 # ---------- TOOLS ----------
 
@@ -501,10 +532,10 @@ def get_calendar(calendar_id: str) -> str:
 def list_calendars() -> str:
     """List all calendars for the user."""
     calendars = calendar_service.calendarList().list().execute().get("items", [])
-    result = "Your Calendars:\n"
+    parts = ["Your Calendars:\n"]
     for cal in calendars:
-        result += f"- {cal.get('summary')} (ID: {cal.get('id')})\n"
-    return result
+        parts.append(f"- {cal.get('summary')} (ID: {cal.get('id')})\n")
+    return "".join(parts)
 
 
 @mcp.tool()
@@ -527,15 +558,15 @@ def list_events(
         orderBy="startTime",
     ).execute().get("items", [])
 
-    result = f"Found {len(events)} events:\n"
+    parts = [f"Found {len(events)} events:\n"]
     for e in events:
-        result += (
+        parts.append(
             f"\nEvent ID: {e['id']}\n"
             f"Summary: {e.get('summary')}\n"
             f"Start: {e['start']}\n"
             f"End: {e['end']}\n"
         )
-    return result
+    return "".join(parts)
 
 
 @mcp.tool()
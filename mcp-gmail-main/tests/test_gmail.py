@@ -0,0 +1,132 @@
+"""
+Tests for batched message fetching in the Gmail module.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from mcp_gmail.gmail import MAX_BATCH_SIZE, get_messages_batch
+
+BatchCallback = Callable[[str, Any, Optional[Exception]], None]
+
+
+class FakeGetRequest:
+    """A messages.get request that can be executed alone or added to a batch."""
+
+    def __init__(self, service: "FakeGmailService", message_id: str, params: Dict[str, Any]):
+        self.service = service
+        self.message_id = message_id
+        self.params = params
+
+    def execute(self) -> Dict[str, Any]:
+        self.service.single_gets.append(self.message_id)
+        return self.service.respond(self.message_id)
+
+
+class FakeBatch:
+    """A batch HTTP request that answers each added request through the callback."""
+
+    def __init__(self, service: "FakeGmailService", callback: BatchCallback):
+        self.service = service
+        self.callback = callback
+        self.requests: List[Tuple[str, FakeGetRequest]] = []
+
+    def add(self, request: FakeGetRequest, request_id: str) -> None:
+        self.requests.append((request_id, request))
+
+    def execute(self) -> None:
+        self.service.batches.append([request_id for request_id, _ in self.requests])
+        for answered, (request_id, request) in enumerate(self.requests):
+            if answered == self.service.fail_batch_after:
+                raise ConnectionError("batch endpoint unavailable")
+            try:
+                self.callback(request_id, self.service.respond(request.message_id), None)
+            except LookupError as e:
+                self.callback(request_id, None, e)
+
+
+class FakeGmailService:
+    """Stand-in for the Gmail API resource covering users().messages().get and batches."""
+
+    def __init__(self, missing: Set[str] = frozenset(), fail_batch_after: Optional[int] = None):
+        self.missing = missing
+        self.fail_batch_after = fail_batch_after
+        self.batches: List[List[str]] = []
+        self.single_gets: List[str] = []
+        self.get_params: List[Dict[str, Any]] = []
+
+    def respond(self, message_id: str) -> Dict[str, Any]:
+        if message_id in self.missing:
+            raise LookupError(f"message {message_id} not found")
+        return {"id": message_id}
+
+    def new_batch_http_request(self, callback: BatchCallback) -> FakeBatch:
+        return FakeBatch(self, callback)
+
+    def users(self) -> "FakeGmailService":
+        return self
+
+    def messages(self) -> "FakeGmailService":
+        return self
+
+    def get(self, userId: str, id: str, **params: Any) -> FakeGetRequest:
+        self.get_params.append(params)
+        return FakeGetRequest(self, id, params)
+
+
+def test_get_messages_batch_uses_one_request_per_chunk():
+    """Test that messages are fetched in batches of MAX_BATCH_SIZE, each ID once."""
+    service = FakeGmailService()
+    message_ids = [f"m{i}" for i in range(MAX_BATCH_SIZE * 2 + 1)]
+
+    messages, errors = get_messages_batch(service, message_ids + message_ids[:3])
+
+    assert [len(batch) for batch in service.batches] == [MAX_BATCH_SIZE, MAX_BATCH_SIZE, 1]
+    assert set(messages) == set(message_ids)
+    assert errors == {}
+    assert service.single_gets == []
+
+
+def test_get_messages_batch_reports_per_message_errors():
+    """Test that a message that fails inside a batch is reported without failing the others."""
+    service = FakeGmailService(missing={"m1"})
+
+    messages, errors = get_messages_batch(service, ["m0", "m1", "m2"])
+
+    assert set(messages) == {"m0", "m2"}
+    assert set(errors) == {"m1"}
+    assert isinstance(errors["m1"], LookupError)
+
+
+def test_get_messages_batch_requests_metadata_headers():
+    """Test that metadata_headers switches the requests to metadata format."""
+    service = FakeGmailService()
+
+    get_messages_batch(service, ["m0"], metadata_headers=["From", "Subject"])
+    get_messages_batch(service, ["m1"])
+
+    assert service.get_params == [
+        {"format": "metadata", "metadataHeaders": ["From", "Subject"]},
+        {},
+    ]
+
+
+def test_get_messages_batch_falls_back_to_single_fetches():
+    """Test that a failed batch fetches only its unanswered messages one by one."""
+    service = FakeGmailService(fail_batch_after=2)
+
+    messages, errors = get_messages_batch(service, ["m0", "m1", "m2", "m3"])
+
+    assert set(messages) == {"m0", "m1", "m2", "m3"}
+    assert errors == {}
+    assert service.single_gets == ["m2", "m3"]
+
+
+def test_get_messages_batch_fallback_reports_errors():
+    """Test that single fetches in the fallback report failures per message."""
+    service = FakeGmailService(missing={"m0", "m2"}, fail_batch_after=1)
+
+    messages, errors = get_messages_batch(service, ["m0", "m1", "m2"])
+
+    assert set(messages) == {"m1"}
+    assert set(errors) == {"m0", "m2"}
+    assert service.single_gets == ["m1", "m2"]
@@ -79,6 +79,36 @@ class RedisCache:
             logger.error(f"Redis connection error getting conversation {conversation_id}: {e}")
             raise
 
+    def get_conversation_history_json(
+        self,
+        conversation_id: str,
+        limit: int = 50
+    ) -> List[str]:
+        """
+        Get conversation history as the JSON documents stored in Redis.
+
+        Skips decoding each message into a dict, for callers that only
+        pass the messages on as JSON.
+
+        Args:
+            conversation_id: Conversation ID
+            limit: Maximum number of messages to retrieve
+
+        Returns:
+            List of JSON-encoded messages (newest first)
+
+        Raises:
+            redis.ConnectionError: If Redis is not connected
+        """
+        key = f"conversation:{conversation_id}"
+
+        try:
+            return self.client.zrevrange(key, 0, limit - 1)
+
+        except redis.ConnectionError as e:
+            logger.error(f"Redis connection error getting conversation {conversation_id}: {e}")
+            raise
+
     def save_conversation_message(
         self,
         conversation_id: str,
@@ -9,11 +9,13 @@ Provides REST API for:
 - Interaction logs (SQLite)
 - General caching (Redis)
 """
+import asyncio
+import json
 import logging
 from contextlib import asynccontextmanager
 from typing import Optional, Dict, Any, List
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
@@ -54,6 +56,11 @@ class InteractionLog(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
 
 
+class ProfileBatchRequest(BaseModel):
+    """Batch profile lookup model."""
+    user_ids: List[str] = Field(..., min_length=1, max_length=100)
+
+
 class CacheValue(BaseModel):
     """Cache value model."""
     value: Any
@@ -169,6 +176,36 @@ async def get_user_profile(user_id: str):
         )
 
 
+@app.post("/profiles/batch_get")
+async def get_user_profiles(request: ProfileBatchRequest):
+    """
+    Get several user profiles from Sanity in one request.
+
+    Lets clients that look up many users at once (e.g. everyone detected
+    at an event) make one round trip and one Sanity query.
+
+    Args:
+        request: IDs of the users to fetch (at most 100)
+
+    Returns:
+        Dict with "profiles" keyed by user ID; unknown users are left out
+
+    Raises:
+        HTTPException: 500 for server errors
+    """
+    try:
+        # The Sanity client is synchronous
+        profiles = await asyncio.to_thread(sanity.get_user_profiles, request.user_ids)
+        return {"profiles": profiles}
+
+    except Exception as e:
+        logger.error(f"Error fetching {len(request.user_ids)} user profiles: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch user profiles: {str(e)}"
+        )
+
+
 @app.patch("/profiles/{user_id}")
 async def update_user_profile(user_id: str, data: Dict[str, Any]):
     """
@@ -218,6 +255,9 @@ async def get_conversation_history(conversation_id: str, limit: int = 50):
         conversation_id: Conversation ID
         limit: Maximum number of messages to retrieve
 
+    Messages are stored as JSON in Redis and spliced into the response
+    as-is rather than decoded to dicts and re-encoded.
+
     Returns:
         Conversation history
 
@@ -225,13 +265,14 @@ async def get_conversation_history(conversation_id: str, limit: int = 50):
         HTTPException: 500 for server errors
     """
     try:
-        messages = cache.get_conversation_history(conversation_id, limit)
+        messages = cache.get_conversation_history_json(conversation_id, limit)
 
-        return {
-            "conversation_id": conversation_id,
-            "messages": messages,
-            "count": len(messages)
-        }
+        body = (
+            f'{{"conversation_id":{json.dumps(conversation_id)},'
+            f'"messages":[{",".join(messages)}],'
+            f'"count":{len(messages)}}}'
+        )
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
         logger.error(f"Error fetching conversation {conversation_id}: {e}")
@@ -281,6 +322,36 @@ async def save_conversation_message(conversation_id: str, message: ConversationM
 
 
 # User Preferences endpoints (SQLite)
+def default_preferences(user_id: str) -> Dict[str, Any]:
+    """
+    Preferences for a user who has not saved any.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Default user preferences
+    """
+    return {
+        'user_id': user_id,
+        'conversation_style': {
+            'tone': 'professional',
+            'length': 'moderate',
+            'formality': 'semi-formal',
+            'emoji_usage': False
+        },
+        'permissions': {
+            'send_message': 'auto_high_match',
+            'schedule_meeting': 'always_ask',
+            'send_email': 'auto_high_match',
+            'share_profile': 'always_auto',
+            'request_connection': 'auto_high_match'
+        },
+        'high_match_threshold': 0.75,
+        'auto_schedule_enabled': True
+    }
+
+
 @app.get("/preferences/{user_id}")
 async def get_user_preferences(user_id: str):
     """
@@ -297,29 +368,7 @@ async def get_user_preferences(user_id: str):
     """
     try:
         preferences = await db.get_user_preferences(user_id)
-
-        if not preferences:
-            # Return default preferences
-            return {
-                'user_id': user_id,
-                'conversation_style': {
-                    'tone': 'professional',
-                    'length': 'moderate',
-                    'formality': 'semi-formal',
-                    'emoji_usage': False
-                },
-                'permissions': {
-                    'send_message': 'auto_high_match',
-                    'schedule_meeting': 'always_ask',
-                    'send_email': 'auto_high_match',
-                    'share_profile': 'always_auto',
-                    'request_connection': 'auto_high_match'
-                },
-                'high_match_threshold': 0.75,
-                'auto_schedule_enabled': True
-            }
-
-        return preferences
+        return preferences or default_preferences(user_id)
 
     except Exception as e:
         logger.error(f"Error fetching preferences for {user_id}: {e}")
@@ -386,6 +435,56 @@ async def update_user_preferences(user_id: str, preferences: UserPreferencesUpda
         )
 
 
+# Combined user data endpoint
+@app.get("/users/{user_id}/bundle")
+async def get_user_bundle(user_id: str, fields: str = "profile,preferences"):
+    """
+    Get several kinds of user data in one request.
+
+    Lets clients that need a user's profile and preferences together make
+    one round trip instead of two; both are fetched concurrently.
+
+    Args:
+        user_id: User ID
+        fields: Comma-separated parts to include ("profile", "preferences")
+
+    Returns:
+        Dict with the requested parts; "profile" is null if the user has no profile
+
+    Raises:
+        HTTPException: 422 for unknown fields, 500 for server errors
+    """
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = set(requested) - {"profile", "preferences"}
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown bundle fields: {', '.join(sorted(unknown))}"
+        )
+
+    try:
+        lookups = {}
+        if "profile" in requested:
+            # The Sanity client is synchronous
+            lookups["profile"] = asyncio.to_thread(sanity.get_user_profile, user_id)
+        if "preferences" in requested:
+            lookups["preferences"] = db.get_user_preferences(user_id)
+
+        results = dict(zip(lookups, await asyncio.gather(*lookups.values())))
+
+        if "preferences" in results:
+            results["preferences"] = results["preferences"] or default_preferences(user_id)
+
+        return results
+
+    except Exception as e:
+        logger.error(f"Error fetching bundle for {user_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch user bundle: {str(e)}"
+        )
+
+
 # Message Templates endpoints (Sanity)
 @app.get("/templates")
 async def get_message_templates(type: str = "introduction"):
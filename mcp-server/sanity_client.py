@@ -1,6 +1,7 @@
 """
 Sanity.io client for user profiles and message templates.
 """
+import json
 import requests
 import logging
 from typing import Optional, Dict, Any, List
@@ -9,6 +10,25 @@ from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Fields returned for a user profile
+_PROFILE_PROJECTION = """{
+    _id,
+    userId,
+    name,
+    email,
+    phone,
+    interests,
+    industry,
+    role,
+    seniority,
+    goals,
+    bio,
+    location,
+    linkedinUrl,
+    twitterHandle,
+    availability
+}"""
+
 
 class SanityClient:
     """Client for interacting with Sanity.io CMS."""
@@ -89,28 +109,34 @@ class SanityClient:
             requests.RequestException: If request fails
         """
         query = f"""
-            *[_type == "userProfile" && userId == "{user_id}"][0] {{
-                _id,
-                userId,
-                name,
-                email,
-                phone,
-                interests,
-                industry,
-                role,
-                seniority,
-                goals,
-                bio,
-                location,
-                linkedinUrl,
-                twitterHandle,
-                availability
-            }}
+            *[_type == "userProfile" && userId == "{user_id}"][0] {_PROFILE_PROJECTION}
         """
 
         result = self.query(query)
         return result
 
+    def get_user_profiles(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several user profiles from Sanity with one query.
+
+        Args:
+            user_ids: User IDs
+
+        Returns:
+            Profiles keyed by user ID; users without a profile are left out
+
+        Raises:
+            requests.RequestException: If request fails
+        """
+        if not user_ids:
+            return {}
+
+        query = f'*[_type == "userProfile" && userId in $ids] {_PROFILE_PROJECTION}'
+
+        # GROQ parameters are passed as JSON-encoded "$name" query params
+        result = self.query(query, {"$ids": json.dumps(list(user_ids))}) or []
+        return {profile["userId"]: profile for profile in result}
+
     def update_user_profile(self, user_id: str, data: Dict[str, Any]) -> bool:
         """
         Update user profile in Sanity.